@@ -5,11 +5,14 @@ import time
 from functools import wraps
 from MediaHub.utils.logging_utils import log_message
 from MediaHub.api.api_utils import api_retry
+from MediaHub.api.tmdb_client import get_tmdb_client
 
 # Global variables for API key status
 api_key = None
 api_warning_logged = False
 
+tmdb_client = get_tmdb_client()
+
 def get_api_key():
     global api_key, api_warning_logged
 
@@ -22,13 +25,14 @@ def get_api_key():
         log_message("TMDB API key is invalid. Exiting script.", level="ERROR")
         sys.exit(1)
 
+    tmdb_client.set_api_key(api_key)
     return api_key
 
 @api_retry(max_retries=3, base_delay=5, max_delay=60)
 def is_valid_api_key(api_key):
     test_url = 'https://api.themoviedb.org/3/configuration?api_key=' + api_key
     try:
-        response = requests.get(test_url)
+        response = tmdb_client.get(test_url)
         if response.status_code == 200:
             return True
         else:
@@ -51,7 +55,7 @@ def check_api_key():
     # Test the API key with a simple request
     try:
         test_url = f"https://api.themoviedb.org/3/configuration?api_key={api_key}"
-        response = requests.get(test_url, timeout=5)
+        response = tmdb_client.get(test_url, timeout=5)
         response.raise_for_status()
 
         # Reset the warning flag if the API key is now working
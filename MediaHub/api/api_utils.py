@@ -2,11 +2,13 @@ import time
 import requests
 from functools import wraps
 from MediaHub.utils.logging_utils import log_message
+from MediaHub.api.rate_limiter import get_rate_limiter
 
 def api_retry(max_retries=3, base_delay=5, max_delay=30):
     """
     Decorator to retry API calls on failure with exponential backoff
-    Specifically handles 429 (Too Many Requests) responses with backoff
+    Specifically handles 429 (Too Many Requests) responses by pausing the shared rate limiter,
+    so all threads wait out the server's Retry-After once instead of each sleeping on its own
     Parameters:
     - max_retries: Maximum number of retry attempts
     - base_delay: Initial delay between retries in seconds
@@ -37,7 +39,8 @@ def api_retry(max_retries=3, base_delay=5, max_delay=30):
                     retries += 1
 
                     # Handling for 429 Too Many Requests
-                    if hasattr(e, 'response') and e.response is not None and e.response.status_code == 429:
+                    rate_limited = hasattr(e, 'response') and e.response is not None and e.response.status_code == 429
+                    if rate_limited:
                         retry_after = e.response.headers.get('Retry-After')
                         if retry_after:
                             try:
@@ -56,7 +59,11 @@ def api_retry(max_retries=3, base_delay=5, max_delay=30):
                         log_message(f"API request error: {str(e)}. Retry {retries}/{max_retries} in {retry_delay} seconds...", level="WARNING")
 
                     if retries <= max_retries:
-                        time.sleep(retry_delay)
+                        if rate_limited:
+                            # The retried request queues in the limiter until the pause ends
+                            get_rate_limiter().penalize(retry_delay)
+                        else:
+                            time.sleep(retry_delay)
                         current_delay = min(current_delay * 2, max_delay)
                     else:
                         log_message(f"All {max_retries} retry attempts failed with error: {str(e)}", level="ERROR")
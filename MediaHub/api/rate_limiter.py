@@ -0,0 +1,146 @@
+import os
+import time
+import heapq
+import threading
+from MediaHub.utils.logging_utils import log_message
+from MediaHub.processors.db_utils import take_tmdb_rate_token
+
+# Lower values are served first when requests are queued
+PRIORITY_INTERACTIVE = 0
+PRIORITY_MONITOR = 1
+PRIORITY_BACKFILL = 2
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: 'interactive',
+    PRIORITY_MONITOR: 'monitor',
+    PRIORITY_BACKFILL: 'backfill',
+}
+
+# Share of the bucket backfill requests leave untouched, so the monitor and interactive
+# lookups of other processes always find tokens available
+BACKFILL_RESERVE = 0.25
+
+_thread_state = threading.local()
+
+def set_request_priority(priority):
+    """Set the priority of TMDB requests made from the current thread."""
+    _thread_state.priority = priority
+
+def get_request_priority():
+    return getattr(_thread_state, 'priority', PRIORITY_INTERACTIVE)
+
+class RateLimiter:
+    """
+    Token bucket shared by every thread in the process. Up to `rate` requests are allowed
+    per `window` seconds, refilled continuously. Queued requests are released strictly
+    by priority, then in arrival order, so backfill scans never delay interactive or
+    monitor lookups.
+    With shared=True the tokens live in the TMDB cache database, so the main process and
+    the monitor subprocess draw from one budget. Backfill requests there only take a token
+    while BACKFILL_RESERVE of the bucket is left for the other priorities. The local bucket
+    is used whenever the shared one cannot be read.
+    """
+
+    def __init__(self, rate, window=1.0, shared=False):
+        self.rate = max(1, rate)
+        self.window = max(0.001, window)
+        self.shared = shared
+        self.capacity = float(self.rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self._waiters = []
+        self._sequence = 0
+        self._cond = threading.Condition()
+        self.stats = {
+            PRIORITY_NAMES[priority]: {'requests': 0, 'queued': 0, 'wait_seconds': 0.0, 'max_wait_seconds': 0.0}
+            for priority in PRIORITY_NAMES
+        }
+
+    def _refill(self, now):
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate / self.window)
+            self.updated = now
+
+    def acquire(self, priority=None):
+        """Block until the caller may send one request. Returns the seconds spent queued."""
+        if priority is None:
+            priority = get_request_priority()
+        start = time.monotonic()
+
+        with self._cond:
+            self._sequence += 1
+            ticket = (priority, self._sequence)
+            heapq.heappush(self._waiters, ticket)
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                shared_wait = None
+                if self._waiters[0] == ticket and now >= self.blocked_until:
+                    shared_wait = self._take_shared(priority)
+                    if shared_wait == 0 or (shared_wait is None and self.tokens >= 1):
+                        if shared_wait is None:
+                            self.tokens -= 1
+                        heapq.heappop(self._waiters)
+                        # The next waiter may be able to use a remaining token
+                        self._cond.notify_all()
+                        break
+                if now < self.blocked_until:
+                    timeout = self.blocked_until - now
+                elif shared_wait is not None:
+                    timeout = max(0.001, shared_wait)
+                else:
+                    timeout = max(0.001, (1 - self.tokens) * self.window / self.rate)
+                self._cond.wait(timeout)
+
+            waited = time.monotonic() - start
+            stats = self.stats[PRIORITY_NAMES.get(priority, 'backfill')]
+            stats['requests'] += 1
+            if waited > 0.001:
+                stats['queued'] += 1
+                stats['wait_seconds'] += waited
+                stats['max_wait_seconds'] = max(stats['max_wait_seconds'], waited)
+
+        if waited >= 1:
+            log_message(f"TMDB request queued {waited:.2f}s by the rate limiter ({PRIORITY_NAMES.get(priority, priority)})", level="DEBUG")
+        return waited
+
+    def _take_shared(self, priority):
+        """Take a token from the cross-process bucket. Returns the seconds to wait, or None."""
+        if not self.shared:
+            return None
+        min_tokens = 1 + (self.capacity * BACKFILL_RESERVE if priority >= PRIORITY_BACKFILL else 0)
+        try:
+            return take_tmdb_rate_token(self.capacity, self.window, min_tokens)
+        except Exception as e:
+            log_message(f"Shared TMDB rate limit unavailable, using the local limit: {e}", level="DEBUG")
+            return None
+
+    def penalize(self, seconds):
+        """Hold every request for the given seconds, e.g. after the server answered 429."""
+        with self._cond:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            self.tokens = 0
+            self._cond.notify_all()
+        if self.shared:
+            try:
+                take_tmdb_rate_token(self.capacity, self.window, block_seconds=seconds)
+            except Exception as e:
+                log_message(f"Unable to share the TMDB rate limit penalty: {e}", level="DEBUG")
+
+    def get_stats(self):
+        with self._cond:
+            return {name: dict(values) for name, values in self.stats.items()}
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+def get_rate_limiter():
+    """Return the process-wide TMDB rate limiter, creating it on first use."""
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = RateLimiter(int(os.getenv('TMDB_RATE_LIMIT') or 40), float(os.getenv('TMDB_RATE_WINDOW') or 1), shared=True)
+    return _limiter
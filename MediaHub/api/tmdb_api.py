@@ -13,6 +13,7 @@ from MediaHub.utils.file_utils import clean_query, normalize_query, standardize_
 from MediaHub.api.tmdb_api_helpers import *
 from MediaHub.api.api_utils import api_retry
 from MediaHub.api.api_key_manager import get_api_key, check_api_key
+from MediaHub.api.tmdb_client import get_tmdb_client
 from MediaHub.api.language_iso_codes import get_iso_code
 
 _api_cache = {}
@@ -21,6 +22,10 @@ _api_cache = {}
 api_key = get_api_key()
 api_warning_logged = False
 
+# Shared keep-alive session for all TMDB requests
+tmdb_client = get_tmdb_client()
+negative_cache = tmdb_client.negative_cache
+
 # Disable urllib3 debug logging
 logging.getLogger("urllib3").setLevel(logging.WARNING)
 
@@ -43,7 +48,7 @@ def search_tv_show(query, year=None, auto_select=False, actual_dir=None, file=No
                 log_message(f"Using provided TMDB ID: {tmdb_id}", level="INFO")
                 url = f"https://api.themoviedb.org/3/tv/{tmdb_id}"
                 params = {'api_key': api_key, 'language': language_iso}
-                response = requests.get(url, params=params)
+                response = tmdb_client.get(url, params=params)
                 response.raise_for_status()
                 show_data = response.json()
 
@@ -56,7 +61,7 @@ def search_tv_show(query, year=None, auto_select=False, actual_dir=None, file=No
                     'external_source': 'imdb_id' if imdb_id else 'tvdb_id',
                     'language': language_iso
                 }
-                response = requests.get(url, params=params)
+                response = tmdb_client.get(url, params=params)
                 response.raise_for_status()
                 results = response.json().get('tv_results', [])
 
@@ -70,7 +75,7 @@ def search_tv_show(query, year=None, auto_select=False, actual_dir=None, file=No
                 # Get full show details
                 url = f"https://api.themoviedb.org/3/tv/{tmdb_id}"
                 params = {'api_key': api_key, 'language': language_iso}
-                response = requests.get(url, params=params)
+                response = tmdb_client.get(url, params=params)
                 response.raise_for_status()
                 show_data = response.json()
 
@@ -101,9 +106,35 @@ def search_tv_show(query, year=None, auto_select=False, actual_dir=None, file=No
     if cache_key in _api_cache:
         return _api_cache[cache_key]
 
+    # Skip the whole fallback chain for inputs that recently resolved to nothing
+    dir_name = os.path.basename(root) if root else None
+    episode_file = file if episode_match else None
+    if negative_cache.is_miss('tv', query, year, dir_name, bool(actual_dir), episode_file):
+        log_message(f"Skipping TMDB search for known unresolvable query '{query}' with year '{year}'.", level="DEBUG")
+        return f"{query}"
+    errors_before = tmdb_client.get_error_count()
+
+    # Cleared when a search variant declines to run (search_variant returns None, e.g. for
+    # single-letter queries) so an unfinished chain is not recorded as a miss; variants
+    # answered from the negative cache count as having run
+    chain_complete = True
+
     url = "https://api.themoviedb.org/3/search/tv"
 
     def fetch_results(query, year=None):
+        nonlocal chain_complete
+        # Variants that recently returned nothing are skipped without a lookup
+        if negative_cache.is_miss('tv-search', query, year):
+            return []
+        variant_errors = tmdb_client.get_error_count()
+        results = search_variant(query, year)
+        if results is None:
+            chain_complete = False
+        elif not results and tmdb_client.get_error_count() == variant_errors:
+            negative_cache.record_miss('tv-search', query, year)
+        return results
+
+    def search_variant(query, year=None):
         if isinstance(query, tuple):
             query = query[0] if query else ""
 
@@ -176,9 +207,14 @@ def search_tv_show(query, year=None, auto_select=False, actual_dir=None, file=No
             log_message(f"Skipping extracted title search for single-letter query: '{query}'", "DEBUG", "stdout")
 
     if not results:
-        if len(query.strip()) > 1:
+        if len(query.strip()) > 1 and not negative_cache.is_miss('tv-web', query, year):
+            variant_errors = tmdb_client.get_error_count()
             results = perform_fallback_tv_search(query, year)
             log_message(f"Primary search failed, attempting fallback TV search", "DEBUG", "stdout")
+            if not results and tmdb_client.get_error_count() == variant_errors:
+                negative_cache.record_miss('tv-web', query, year)
+        elif len(query.strip()) > 1:
+            log_message(f"Skipping fallback TV search for known unresolvable query: '{query}'", "DEBUG", "stdout")
         else:
             log_message(f"Skipping fallback TV search for single-letter query: '{query}'", "DEBUG", "stdout")
 
@@ -205,7 +241,7 @@ def search_tv_show(query, year=None, auto_select=False, actual_dir=None, file=No
         fallback_url = f"https://api.themoviedb.org/3/search/tv?api_key={api_key}&query={year}"
         log_message(f"Fallback search URL: {fallback_url}", "DEBUG", "stdout")
         try:
-            response = requests.get(fallback_url)
+            response = tmdb_client.get(fallback_url)
             response.raise_for_status()
             results = response.json().get('results', [])
             if results:
@@ -247,6 +283,8 @@ def search_tv_show(query, year=None, auto_select=False, actual_dir=None, file=No
 
     if not results:
         log_message(f"No results found for query '{query}' with year '{year}'.", level="WARNING")
+        if chain_complete and tmdb_client.get_error_count() == errors_before:
+            negative_cache.record_miss('tv', query, year, dir_name, bool(actual_dir), episode_file)
         _api_cache[cache_key] = f"{query}"
         return f"{query}"
 
@@ -308,7 +346,7 @@ def perform_fallback_tv_search(query, year=None):
     cleaned_query = remove_genre_names(query)
     search_url = f"https://www.themoviedb.org/search?query={urllib.parse.quote_plus(cleaned_query)}"
 
-    response = requests.get(search_url)
+    response = tmdb_client.get(search_url)
     response.raise_for_status()
     soup = BeautifulSoup(response.text, 'html.parser')
     tv_show_link = soup.find('a', class_='result')
@@ -321,7 +359,7 @@ def perform_fallback_tv_search(query, year=None):
             # Fetch TV show details using the TV show ID
             details_url = f"https://api.themoviedb.org/3/tv/{tmdb_id}"
             params = {'api_key': api_key}
-            details_response = requests.get(details_url, params=params)
+            details_response = tmdb_client.get(details_url, params=params)
             details_response.raise_for_status()
             tv_show_details = details_response.json()
 
@@ -345,7 +383,7 @@ def perform_search(params, url):
         query = re.sub(r'\band\b', '&', query)
         params['query'] = query
 
-        response = requests.get(url, params=params)
+        response = tmdb_client.get(url, params=params)
         response.raise_for_status()
         results = response.json().get('results', [])
 
@@ -393,7 +431,7 @@ def search_movie(query, year=None, auto_select=False, actual_dir=None, file=None
                 log_message(f"Using provided TMDB ID: {tmdb_id}", level="INFO")
                 url = f"https://api.themoviedb.org/3/movie/{tmdb_id}"
                 params = {'api_key': api_key, 'language': language_iso}
-                response = requests.get(url, params=params)
+                response = tmdb_client.get(url, params=params)
                 response.raise_for_status()
                 movie_data = response.json()
 
@@ -404,7 +442,7 @@ def search_movie(query, year=None, auto_select=False, actual_dir=None, file=None
                     'external_source': 'imdb_id',
                     'language': language_iso
                 }
-                response = requests.get(url, params=params)
+                response = tmdb_client.get(url, params=params)
                 response.raise_for_status()
                 results = response.json().get('movie_results', [])
 
@@ -418,7 +456,7 @@ def search_movie(query, year=None, auto_select=False, actual_dir=None, file=None
                 # Get full movie details
                 url = f"https://api.themoviedb.org/3/movie/{tmdb_id}"
                 params = {'api_key': api_key, 'language': language_iso}
-                response = requests.get(url, params=params)
+                response = tmdb_client.get(url, params=params)
                 response.raise_for_status()
                 movie_data = response.json()
 
@@ -456,9 +494,34 @@ def search_movie(query, year=None, auto_select=False, actual_dir=None, file=None
         else:
             return cached_result
 
+    # Skip the whole fallback chain for inputs that recently resolved to nothing
+    dir_name = os.path.basename(root) if root else None
+    if negative_cache.is_miss('movie', query, year, dir_name, bool(actual_dir), file):
+        log_message(f"Skipping TMDB search for known unresolvable query '{query}' with year '{year}'.", level="DEBUG")
+        return f"{query}"
+    errors_before = tmdb_client.get_error_count()
+
+    # Cleared when a search variant declines to run (search_variant returns None, e.g. for
+    # single-letter queries) so an unfinished chain is not recorded as a miss; variants
+    # answered from the negative cache count as having run
+    chain_complete = True
+
     url = "https://api.themoviedb.org/3/search/movie"
 
     def fetch_results(query, year=None):
+        nonlocal chain_complete
+        # Variants that recently returned nothing are skipped without a lookup
+        if negative_cache.is_miss('movie-search', query, year):
+            return []
+        variant_errors = tmdb_client.get_error_count()
+        results = search_variant(query, year)
+        if results is None:
+            chain_complete = False
+        elif not results and tmdb_client.get_error_count() == variant_errors:
+            negative_cache.record_miss('movie-search', query, year)
+        return results
+
+    def search_variant(query, year=None):
         params = {'api_key': api_key, 'query': query, 'language': language_iso}
         if year:
             params['primary_release_year'] = year
@@ -526,6 +589,8 @@ def search_movie(query, year=None, auto_select=False, actual_dir=None, file=None
 
     if not results:
         log_message(f"No results found for query '{query}' with year '{year}'.", "WARNING", "stdout")
+        if chain_complete and tmdb_client.get_error_count() == errors_before:
+            negative_cache.record_miss('movie', query, year, dir_name, bool(actual_dir), file)
         _api_cache[cache_key] = f"{query}"
         return f"{query}"
 
@@ -616,7 +681,7 @@ def perform_fallback_search(query, year=None):
     cleaned_query = remove_genre_names(query)
     search_url = f"https://www.themoviedb.org/search?query={urllib.parse.quote_plus(cleaned_query)}"
 
-    response = requests.get(search_url)
+    response = tmdb_client.get(search_url)
     response.raise_for_status()
     soup = BeautifulSoup(response.text, 'html.parser')
     movie_link = soup.find('a', class_='result')
@@ -628,7 +693,7 @@ def perform_fallback_search(query, year=None):
 
             details_url = f"https://api.themoviedb.org/3/movie/{tmdb_id}"
             params = {'api_key': api_key}
-            details_response = requests.get(details_url, params=params)
+            details_response = tmdb_client.get(details_url, params=params)
             details_response.raise_for_status()
             movie_details = details_response.json()
 
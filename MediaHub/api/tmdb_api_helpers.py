@@ -14,6 +14,7 @@ from MediaHub.utils.logging_utils import log_message
 from MediaHub.config.config import is_imdb_folder_id_enabled, is_tvdb_folder_id_enabled, is_tmdb_folder_id_enabled, tmdb_api_language
 from MediaHub.utils.file_utils import clean_query, normalize_query, standardize_title, remove_genre_names, extract_title, clean_query_movie, advanced_clean_query
 from MediaHub.api.api_key_manager import get_api_key, check_api_key
+from MediaHub.api.tmdb_client import get_tmdb_client
 from MediaHub.api.language_iso_codes import get_iso_code
 
 _api_cache = {}
@@ -22,6 +23,9 @@ _api_cache = {}
 api_key = get_api_key()
 api_warning_logged = False
 
+# Shared keep-alive session for all TMDB requests
+tmdb_client = get_tmdb_client()
+
 # Disable urllib3 debug logging
 logging.getLogger("urllib3").setLevel(logging.WARNING)
 
@@ -34,7 +38,7 @@ def get_external_ids(item_id, media_type):
     params = {'api_key': api_key, 'language': language_iso}
 
     try:
-        response = requests.get(url, params=params)
+        response = tmdb_client.get(url, params=params)
         response.raise_for_status()
         return response.json()
     except requests.exceptions.RequestException as e:
@@ -58,7 +62,7 @@ def get_movie_genres(movie_id):
     params = {'api_key': api_key, 'language': language_iso}
 
     try:
-        response = requests.get(url, params=params)
+        response = tmdb_client.get(url, params=params)
         response.raise_for_status()
         movie_details = response.json()
 
@@ -66,7 +70,7 @@ def get_movie_genres(movie_id):
         language = movie_details.get('original_language', '')
 
         keywords_url = f"https://api.themoviedb.org/3/movie/{movie_id}/keywords"
-        keywords_response = requests.get(keywords_url, params=params)
+        keywords_response = tmdb_client.get(keywords_url, params=params)
         keywords_response.raise_for_status()
         keywords = [kw['name'].lower() for kw in keywords_response.json().get('keywords', [])]
 
@@ -105,7 +109,7 @@ def get_show_genres(show_id):
 
     try:
         # Get show details including genres
-        response = requests.get(url, params=params)
+        response = tmdb_client.get(url, params=params)
         response.raise_for_status()
         show_details = response.json()
 
@@ -114,7 +118,7 @@ def get_show_genres(show_id):
 
         # Get keywords for the show
         keywords_url = f"https://api.themoviedb.org/3/tv/{show_id}/keywords"
-        keywords_response = requests.get(keywords_url, params=params)
+        keywords_response = tmdb_client.get(keywords_url, params=params)
         keywords_response.raise_for_status()
         keywords = [kw['name'].lower() for kw in keywords_response.json().get('results', [])]
 
@@ -168,7 +172,7 @@ def get_episode_name(show_id, season_number, episode_number, max_length=60, forc
         # First try direct episode lookup
         url = f"https://api.themoviedb.org/3/tv/{show_id}/season/{season_number}/episode/{episode_number}"
         params = {'api_key': api_key, 'language': language_iso}
-        response = requests.get(url, params=params)
+        response = tmdb_client.get(url, params=params)
         response.raise_for_status()
         episode_data = response.json()
         episode_name = episode_data.get('name')
@@ -214,7 +218,7 @@ def map_absolute_episode(show_id, absolute_episode, api_key, max_length=60):
     show_params = {'api_key': api_key}
 
     try:
-        show_response = requests.get(show_url, params=show_params)
+        show_response = tmdb_client.get(show_url, params=show_params)
         show_response.raise_for_status()
         show_data = show_response.json()
 
@@ -229,7 +233,7 @@ def map_absolute_episode(show_id, absolute_episode, api_key, max_length=60):
         for season in range(1, total_seasons + 1):
             try:
                 season_detail_url = f"https://api.themoviedb.org/3/tv/{show_id}/season/{season}"
-                season_detail_response = requests.get(season_detail_url, params={'api_key': api_key})
+                season_detail_response = tmdb_client.get(season_detail_url, params={'api_key': api_key})
                 season_detail_response.raise_for_status()
                 season_detail = season_detail_response.json()
 
@@ -254,7 +258,7 @@ def map_absolute_episode(show_id, absolute_episode, api_key, max_length=60):
                 try:
                     # Try to get episode with the exact absolute number
                     direct_url = f"https://api.themoviedb.org/3/tv/{show_id}/season/{season}/episode/{absolute_episode}"
-                    direct_response = requests.get(direct_url, params={'api_key': api_key})
+                    direct_response = tmdb_client.get(direct_url, params={'api_key': api_key})
 
                     # If successful, we found our episode!
                     if direct_response.status_code == 200:
@@ -295,7 +299,7 @@ def map_absolute_episode(show_id, absolute_episode, api_key, max_length=60):
                 # Get the episode name
                 try:
                     mapped_url = f"https://api.themoviedb.org/3/tv/{show_id}/season/{season}/episode/{current_episode}"
-                    mapped_response = requests.get(mapped_url, params={'api_key': api_key})
+                    mapped_response = tmdb_client.get(mapped_url, params={'api_key': api_key})
                     mapped_response.raise_for_status()
                     mapped_episode_data = mapped_response.json()
                     mapped_episode_name = mapped_episode_data.get('name')
@@ -321,7 +325,7 @@ def map_absolute_episode(show_id, absolute_episode, api_key, max_length=60):
         for season in range(total_seasons, 0, -1):
             try:
                 direct_url = f"https://api.themoviedb.org/3/tv/{show_id}/season/{season}/episode/{absolute_episode}"
-                direct_response = requests.get(direct_url, params={'api_key': api_key})
+                direct_response = tmdb_client.get(direct_url, params={'api_key': api_key})
 
                 if direct_response.status_code == 200:
                     direct_episode_data = direct_response.json()
@@ -356,7 +360,7 @@ def map_absolute_episode(show_id, absolute_episode, api_key, max_length=60):
         # Try to get episode name for final fallback
         try:
             mapped_url = f"https://api.themoviedb.org/3/tv/{show_id}/season/{last_season}/episode/{fallback_episode}"
-            mapped_response = requests.get(mapped_url, params={'api_key': api_key})
+            mapped_response = tmdb_client.get(mapped_url, params={'api_key': api_key})
             mapped_response.raise_for_status()
             mapped_episode_data = mapped_response.json()
             mapped_episode_name = mapped_episode_data.get('name', 'Unknown Episode')
@@ -379,7 +383,7 @@ def map_absolute_episode(show_id, absolute_episode, api_key, max_length=60):
         try:
             # Try with season 1 as default
             direct_url = f"https://api.themoviedb.org/3/tv/{show_id}/season/1/episode/{absolute_episode}"
-            direct_response = requests.get(direct_url, params={'api_key': api_key})
+            direct_response = tmdb_client.get(direct_url, params={'api_key': api_key})
 
             if direct_response.status_code == 200:
                 direct_episode_data = direct_response.json()
@@ -410,7 +414,7 @@ def get_movie_collection(movie_id=None, movie_title=None, year=None):
             'primary_release_year': year
         }
         try:
-            search_response = requests.get(search_url, params=search_params)
+            search_response = tmdb_client.get(search_url, params=search_params)
             search_response.raise_for_status()
             search_results = search_response.json().get('results', [])
 
@@ -429,7 +433,7 @@ def get_movie_collection(movie_id=None, movie_title=None, year=None):
         return None
 
     try:
-        response = requests.get(url, params=params)
+        response = tmdb_client.get(url, params=params)
         response.raise_for_status()
         movie_data = response.json()
         collection = movie_data.get('belongs_to_collection')
@@ -521,7 +525,7 @@ def get_show_seasons(tmdb_id):
     params = {'api_key': api_key}
 
     try:
-        response = requests.get(url, params=params)
+        response = tmdb_client.get(url, params=params)
         response.raise_for_status()
         show_data = response.json()
         return show_data.get('seasons', [])
@@ -612,7 +616,7 @@ def get_available_episodes(tmdb_id, season_number, api_key):
     episodes_params = {'api_key': api_key}
 
     try:
-        episodes_response = requests.get(episodes_url, params=episodes_params)
+        episodes_response = tmdb_client.get(episodes_url, params=episodes_params)
         episodes_response.raise_for_status()
         season_data = episodes_response.json()
         return season_data.get('episodes', [])
@@ -0,0 +1,176 @@
+import os
+import time
+import threading
+import requests
+from urllib.parse import urlsplit, parse_qsl, urlencode
+from requests.structures import CaseInsensitiveDict
+from MediaHub.processors.db_utils import get_tmdb_cache_entry, save_tmdb_cache_entry, refresh_tmdb_cache_entry
+from MediaHub.processors.db_utils import get_negative_cache_expiry, save_negative_cache_entry
+
+# Params that do not change the response and must not end up in cache keys
+IGNORED_PARAMS = {'api_key'}
+
+def _ttl_hours(name, default):
+    return float(os.getenv(name) or default) * 3600
+
+class TMDBResponseCache:
+    """
+    Persistent cache of successful TMDB API responses, keyed by endpoint path and sorted
+    params. Search results, details and season/episode lists expire on their own TTLs;
+    expired entries are revalidated with ETag/Last-Modified so an unchanged response
+    costs a 304 instead of a full body.
+    """
+
+    def __init__(self):
+        self.enabled = os.getenv('TMDB_CACHE_ENABLED', 'true').lower() in ['true', '1', 'yes']
+        self.ttls = {
+            'search': _ttl_hours('TMDB_CACHE_SEARCH_TTL', 24),
+            'details': _ttl_hours('TMDB_CACHE_DETAILS_TTL', 168),
+            'episodes': _ttl_hours('TMDB_CACHE_EPISODES_TTL', 24),
+        }
+        self.stats = {'hits': 0, 'revalidated': 0, 'misses': 0}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(url, params=None):
+        """Normalize a TMDB URL and its params into a cache key."""
+        parts = urlsplit(url)
+        query = [(key, str(value)) for key, value in parse_qsl(parts.query)]
+        query.extend((key, str(value)) for key, value in (params or {}).items() if value is not None)
+        query = sorted((key, value) for key, value in query if key not in IGNORED_PARAMS)
+        path = parts.path.rstrip('/')
+        return f"{path}?{urlencode(query)}" if query else path
+
+    @staticmethod
+    def category(url):
+        """Return the TTL category of an endpoint, or None if it must not be cached."""
+        path = urlsplit(url).path
+        if path.endswith('/configuration'):
+            return None
+        if '/search/' in path:
+            return 'search'
+        if '/season/' in path or '/episode/' in path:
+            return 'episodes'
+        return 'details'
+
+    def _count(self, stat):
+        with self._lock:
+            self.stats[stat] += 1
+
+    @staticmethod
+    def _build_response(url, body):
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response.url = url
+        response._content = body
+        response.encoding = 'utf-8'
+        response.headers = CaseInsensitiveDict({'Content-Type': 'application/json;charset=utf-8'})
+        response.from_cache = True
+        return response
+
+    def get(self, url, params, fetch):
+        """
+        Serve url from the cache, or call fetch(extra_headers) to request it and store the
+        result. fetch must return a requests.Response.
+        """
+        category = self.category(url) if self.enabled else None
+        if category is None:
+            return fetch({})
+
+        key = self.make_key(url, params)
+        entry = get_tmdb_cache_entry(key)
+        now = time.time()
+        if entry and entry[3] > now:
+            self._count('hits')
+            return self._build_response(url, entry[0])
+
+        headers = {}
+        if entry:
+            if entry[1]:
+                headers['If-None-Match'] = entry[1]
+            if entry[2]:
+                headers['If-Modified-Since'] = entry[2]
+
+        response = fetch(headers)
+        expires_at = time.time() + self.ttls[category]
+        if response.status_code == 304 and entry:
+            self._count('revalidated')
+            refresh_tmdb_cache_entry(key, expires_at)
+            return self._build_response(url, entry[0])
+
+        self._count('misses')
+        if response.status_code == 200:
+            save_tmdb_cache_entry(key, response.content, response.headers.get('ETag'),
+                                  response.headers.get('Last-Modified'), expires_at)
+        return response
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats)
+
+class NegativeResultCache:
+    """
+    Persistent record of search variants that resolved to nothing. Each entry is keyed by
+    the kind of lookup and its normalized inputs and expires after the configured TTL, so
+    junk and sample files stop walking the whole fallback chain on every scan.
+    Known misses are memoized in a bounded dict; keys without an entry are always read
+    from the database, so misses recorded by another process are seen.
+    """
+
+    # Memoized misses kept in memory before expired ones are dropped
+    MAX_MEMOIZED = 10000
+
+    def __init__(self):
+        self.ttl = _ttl_hours('TMDB_NEGATIVE_CACHE_TTL', 24)
+        self.stats = {'hits': 0, 'recorded': 0}
+        self._expiry = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(kind, *parts):
+        normalized = []
+        for part in parts:
+            if isinstance(part, tuple):
+                part = part[0] if part else ''
+            normalized.append(' '.join(str(part if part is not None else '').lower().split()))
+        return f"{kind}:" + '|'.join(normalized)
+
+    def is_miss(self, kind, *parts):
+        if self.ttl <= 0:
+            return False
+        key = self.make_key(kind, *parts)
+        with self._lock:
+            expires_at = self._expiry.get(key)
+        if expires_at is None or expires_at <= time.time():
+            expires_at = get_negative_cache_expiry(key) or 0
+            if expires_at > time.time():
+                self._memoize(key, expires_at)
+        if expires_at > time.time():
+            with self._lock:
+                self.stats['hits'] += 1
+            return True
+        return False
+
+    def record_miss(self, kind, *parts):
+        if self.ttl <= 0:
+            return
+        key = self.make_key(kind, *parts)
+        expires_at = time.time() + self.ttl
+        self._memoize(key, expires_at)
+        with self._lock:
+            self.stats['recorded'] += 1
+        save_negative_cache_entry(key, expires_at)
+
+    def _memoize(self, key, expires_at):
+        with self._lock:
+            if len(self._expiry) >= self.MAX_MEMOIZED and key not in self._expiry:
+                now = time.time()
+                self._expiry = {cached: expiry for cached, expiry in self._expiry.items() if expiry > now}
+                if len(self._expiry) >= self.MAX_MEMOIZED:
+                    self._expiry.clear()
+            self._expiry[key] = expires_at
+
+    def get_stats(self):
+        with self._lock:
+            return dict(self.stats)
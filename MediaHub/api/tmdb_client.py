@@ -0,0 +1,137 @@
+import os
+import copy
+import threading
+import requests
+from multiprocessing import cpu_count
+from requests.adapters import HTTPAdapter
+from MediaHub.api.rate_limiter import get_rate_limiter
+from MediaHub.api.tmdb_cache import TMDBResponseCache, NegativeResultCache
+from MediaHub.processors.db_utils import initialize_tmdb_cache
+
+TMDB_API_BASE_URL = "https://api.themoviedb.org/3"
+
+class SingleFlight:
+    """
+    Collapses concurrent calls with the same key into one. The first caller runs the
+    function; callers arriving while it is in flight wait and share its result or error.
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    def do(self, key, func):
+        """Run func for key, or wait for the in-flight call. Returns (result, shared)."""
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = {'done': threading.Event(), 'result': None, 'error': None}
+            else:
+                self.coalesced += 1
+
+        if leader:
+            try:
+                flight['result'] = func()
+            except BaseException as e:
+                flight['error'] = e
+            finally:
+                with self._lock:
+                    del self._flights[key]
+                flight['done'].set()
+        else:
+            flight['done'].wait()
+
+        if flight['error'] is not None:
+            raise flight['error']
+        return flight['result'], not leader
+
+class TMDBClient:
+    """
+    Keep-alive HTTP client shared by every TMDB call in the process.
+    Connections are pooled per host and reused across worker threads, every request gets
+    a default timeout, and TMDB API requests carry the shared base params (the API key),
+    are served from the persistent response cache when possible and otherwise pass
+    through the process-wide rate limiter. Identical requests already in flight on
+    another thread are waited for instead of being sent again.
+    """
+
+    def __init__(self, pool_size=None, timeout=None):
+        self.pool_size = pool_size or int(os.getenv('TMDB_POOL_SIZE') or cpu_count())
+        read_timeout = timeout or float(os.getenv('TMDB_TIMEOUT') or 15)
+        self.timeout = (min(5.0, read_timeout), read_timeout)
+        self.base_params = {}
+        self.limiter = get_rate_limiter()
+        initialize_tmdb_cache()
+        self.cache = TMDBResponseCache()
+        self.negative_cache = NegativeResultCache()
+        self._local = threading.local()
+        self.flights = SingleFlight()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def set_api_key(self, api_key):
+        self.base_params['api_key'] = api_key
+
+    def get_error_count(self):
+        """
+        Number of failed requests made by the current thread. Callers compare it before
+        and after a lookup so a miss caused by a network or server error is not cached.
+        """
+        return getattr(self._local, 'errors', 0)
+
+    def _record_error(self):
+        self._local.errors = self.get_error_count() + 1
+
+    def get(self, url, params=None, **kwargs):
+        """
+        GET a URL through the shared session. Paths starting with '/' are resolved against
+        the TMDB API, and base params are added unless the caller already set them.
+        """
+        if url.startswith('/'):
+            url = TMDB_API_BASE_URL + url
+        try:
+            response = self._get(url, params, **kwargs)
+        except requests.exceptions.RequestException:
+            self._record_error()
+            raise
+        # 404 is a definite "not found"; anything else in the error range is not
+        if response.status_code >= 400 and response.status_code != 404:
+            self._record_error()
+        return response
+
+    def _get(self, url, params=None, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        if not url.startswith(TMDB_API_BASE_URL):
+            return self.session.get(url, params=params, **kwargs)
+
+        if self.base_params:
+            merged = {key: value for key, value in self.base_params.items() if f"{key}=" not in url}
+            merged.update(params or {})
+            params = merged
+        headers = kwargs.pop('headers', None) or {}
+
+        def fetch(validators):
+            self.limiter.acquire()
+            return self.session.get(url, params=params, headers={**headers, **validators}, **kwargs)
+
+        key = self.cache.make_key(url, params)
+        response, shared = self.flights.do(key, lambda: self.cache.get(url, params, fetch))
+        # Each waiter gets its own Response object over the shared body
+        return copy.copy(response) if shared else response
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_tmdb_client():
+    """Return the process-wide TMDB client, creating it on first use."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = TMDBClient()
+    return _client
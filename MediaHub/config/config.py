@@ -54,6 +54,46 @@ def is_rclone_mount_enabled():
 def is_mount_check_interval():
     return int(os.getenv('MOUNT_CHECK_INTERVAL', '30'))
 
+def get_mount_probe_timeout():
+    return float(os.getenv('MOUNT_PROBE_TIMEOUT', '10'))
+
+def is_incremental_scan_enabled():
+    return os.getenv('INCREMENTAL_SCAN', 'true').lower() == 'true'
+
+def get_source_scan_workers():
+    return max(1, int(os.getenv('SOURCE_SCAN_WORKERS', '8')))
+
+def is_inotify_monitor_enabled():
+    return os.getenv('INOTIFY_MONITOR', 'true').lower() == 'true'
+
+def get_monitor_settle_seconds():
+    return float(os.getenv('MONITOR_SETTLE_SECONDS', '15'))
+
+def get_min_poll_interval():
+    return float(os.getenv('POLL_INTERVAL_MIN', '5'))
+
+def get_max_poll_interval():
+    return float(os.getenv('POLL_INTERVAL_MAX', '600'))
+
+def get_monitor_scan_timeout():
+    return float(os.getenv('MONITOR_SCAN_TIMEOUT', '120'))
+
+def get_ingest_host():
+    return os.getenv('MONITOR_INGEST_HOST', '127.0.0.1')
+
+def get_ingest_port():
+    port = os.getenv('MONITOR_INGEST_PORT', '').strip()
+    return int(port) if port else None
+
+def get_ingest_socket():
+    return os.getenv('MONITOR_INGEST_SOCKET', '').strip() or None
+
+def get_file_index_reconcile_hours():
+    return float(os.getenv('FILE_INDEX_RECONCILE_HOURS', '24'))
+
+def get_event_retention():
+    return int(os.getenv('EVENT_RETENTION', '500000'))
+
 def is_anime_scan():
     return os.getenv('ANIME_SCAN', 'false').lower() == 'true'
 
@@ -8,6 +8,7 @@ import psutil
 import signal
 import socket
 import psutil
+import json
 
 # Append the parent directory to the system path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -214,6 +215,7 @@ def handle_exit(signum, frame):
     terminate_flag.set()
     terminate_subprocesses()
     remove_lock_file()
+    flush_pending_writes()
     os._exit(0)
 
 def setup_signal_handlers():
@@ -267,6 +269,27 @@ def parse_season_episode(season_episode):
         return int(match.group(1)), int(match.group(2))
     return None, None
 
+def stream_events(cursor_id, follow=False, poll_interval=1.0):
+    """Print journal events after cursor_id as JSON lines, optionally waiting for new ones."""
+    oldest_id, _ = get_event_bounds()
+    if oldest_id and cursor_id < oldest_id - 1:
+        print(f"Warning: events up to {oldest_id - 1} have been pruned; a full resync is needed", file=sys.stderr)
+
+    fields = ('id', 'type', 'source', 'destination', 'tmdb_id', 'created_at')
+    try:
+        while True:
+            events = fetch_events_since(cursor_id)
+            for event in events:
+                print(json.dumps(dict(zip(fields, event))), flush=True)
+            if events:
+                cursor_id = events[-1][0]
+                continue
+            if not follow:
+                break
+            time.sleep(poll_interval)
+    except (KeyboardInterrupt, BrokenPipeError):
+        pass
+
 # CineSync WebDAV
 def is_port_in_use(port):
     """Check if a port is already in use using multiple methods."""
@@ -362,6 +385,10 @@ def main(dest_dir):
                          help="Search for files in database matching the given pattern")
     db_group.add_argument("--optimize", action="store_true",
                          help="Optimize database indexes and analyze tables")
+    db_group.add_argument("--events", metavar="CURSOR", type=int,
+                         help="Print symlink change events after the given event id as JSON lines (0 for all)")
+    db_group.add_argument("--follow", action="store_true",
+                         help="With --events, keep printing new events as they are recorded")
 
     args = parser.parse_args()
 
@@ -398,6 +425,10 @@ def main(dest_dir):
         optimize_database()
         return
 
+    if args.events is not None:
+        stream_events(args.events, args.follow)
+        return
+
     if args.reset:
         if input("Are you sure you want to reset the database? This will delete all entries. (Y/N): ").lower() == 'y':
             reset_database()
@@ -411,6 +442,15 @@ def main(dest_dir):
             log_message(f"Archived Records: {stats['archived_records']}", level="INFO")
             log_message(f"Main DB Size: {stats['main_db_size']:.2f} MB", level="INFO")
             log_message(f"Archive DB Size: {stats['archive_db_size']:.2f} MB", level="INFO")
+            # Throttle counters live in the monitor process and are checkpointed by it
+            monitor_state = get_monitor_state()
+            if monitor_state.get('throttled_calls'):
+                log_message(f"Write Throttle Waits: {monitor_state['throttled_calls']} ({float(monitor_state['throttle_wait_seconds']):.2f}s total)", level="INFO")
+                log_message(f"Write Contention Events: {monitor_state['contention_events']} ({float(monitor_state.get('write_busy_seconds') or 0):.2f}s busy)", level="INFO")
+            if monitor_state.get('poll_interval'):
+                log_message(f"Monitor Poll Interval: {float(monitor_state['poll_interval']):.1f}s (last scan {float(monitor_state['last_scan_seconds']):.2f}s, average {float(monitor_state['avg_scan_seconds']):.2f}s)", level="INFO")
+            if monitor_state.get('degraded_roots'):
+                log_message(f"Degraded Source Directories: {monitor_state['degraded_roots']}", level="WARNING")
         return
 
     if not os.path.exists(LOCK_FILE):
@@ -0,0 +1,150 @@
+import os
+import json
+import queue
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from socketserver import ThreadingMixIn, UnixStreamServer
+from MediaHub.utils.logging_utils import log_message
+
+MAX_BODY_BYTES = 1024 * 1024
+
+class UnixHTTPServer(ThreadingMixIn, UnixStreamServer):
+    daemon_threads = True
+
+class IngestRequestHandler(BaseHTTPRequestHandler):
+    """
+    POST /ingest with {"paths": [...]} queues files or directories for processing.
+    GET /status returns the monitor metrics as JSON.
+    """
+
+    server_version = "CineSyncIngest/1.0"
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path.rstrip('/') != '/status':
+            self._send_json(404, {'error': 'not found'})
+            return
+        self._send_json(200, self.server.ingest.get_status())
+
+    def do_POST(self):
+        if self.path.rstrip('/') != '/ingest':
+            self._send_json(404, {'error': 'not found'})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+        except ValueError:
+            length = -1
+        if length <= 0 or length > MAX_BODY_BYTES:
+            self._send_json(400, {'error': 'missing or oversized request body'})
+            return
+
+        try:
+            payload = json.loads(self.rfile.read(length))
+            paths = payload['paths'] if isinstance(payload, dict) else payload
+            if isinstance(paths, str):
+                paths = [paths]
+            if not isinstance(paths, list) or not all(isinstance(path, str) for path in paths):
+                raise ValueError("paths must be a list of strings")
+        except (ValueError, KeyError) as e:
+            self._send_json(400, {'error': f"invalid request: {e}"})
+            return
+
+        accepted, rejected = self.server.ingest.enqueue(paths)
+        self._send_json(202 if accepted else 400, {'accepted': accepted, 'rejected': rejected})
+
+    def log_message(self, format, *args):
+        log_message(f"Ingest request: {format % args}", level="DEBUG")
+
+class IngestServer:
+    """
+    Loopback HTTP or Unix socket endpoint that lets downloaders push finished paths into
+    the running monitor. Accepted paths are queued and handed to the handler on a single
+    worker thread in batches, skipping both the poll delay and a new process start.
+    """
+
+    def __init__(self, src_dirs, handler, status_provider, host='127.0.0.1', port=None, socket_path=None):
+        self.src_dirs = [os.path.normpath(directory) for directory in src_dirs]
+        self.handler = handler
+        self.status_provider = status_provider
+        self.host = host
+        self.port = port
+        self.socket_path = socket_path
+        self._queue = queue.Queue()
+        self._httpd = None
+        self.stats = {'requests': 0, 'accepted': 0, 'rejected': 0, 'processed': 0}
+        self._stats_lock = threading.Lock()
+
+    def _is_allowed(self, path):
+        if not os.path.isabs(path):
+            return False
+        return any(path == directory or path.startswith(directory.rstrip(os.sep) + os.sep) for directory in self.src_dirs)
+
+    def enqueue(self, paths):
+        """Queue paths inside the configured source directories. Returns (accepted, rejected)."""
+        accepted = []
+        rejected = []
+        for path in paths:
+            path = os.path.normpath(path)
+            (accepted if self._is_allowed(path) else rejected).append(path)
+        with self._stats_lock:
+            self.stats['requests'] += 1
+            self.stats['accepted'] += len(accepted)
+            self.stats['rejected'] += len(rejected)
+        for path in accepted:
+            self._queue.put(path)
+        if rejected:
+            log_message(f"Ingest rejected paths outside the source directories: {rejected}", level="WARNING")
+        return accepted, rejected
+
+    def get_status(self):
+        status = dict(self.status_provider())
+        with self._stats_lock:
+            status['ingest'] = dict(self.stats, pending=self._queue.qsize())
+        return status
+
+    def _drain(self):
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            batch = list(dict.fromkeys(batch))
+            log_message(f"Processing {len(batch)} ingested paths", level="INFO")
+            try:
+                self.handler(batch)
+            except Exception as e:
+                log_message(f"Error processing ingested paths: {e}", level="ERROR")
+            with self._stats_lock:
+                self.stats['processed'] += len(batch)
+
+    def start(self):
+        if self.socket_path:
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+            self._httpd = UnixHTTPServer(self.socket_path, IngestRequestHandler)
+            endpoint = f"unix:{self.socket_path}"
+        else:
+            self._httpd = ThreadingHTTPServer((self.host, self.port), IngestRequestHandler)
+            endpoint = f"http://{self.host}:{self._httpd.server_address[1]}"
+        self._httpd.ingest = self
+
+        threading.Thread(target=self._drain, name="ingest-worker", daemon=True).start()
+        threading.Thread(target=self._httpd.serve_forever, name="ingest-server", daemon=True).start()
+        log_message(f"Monitor ingest endpoint listening on {endpoint}", level="INFO")
+
+    def stop(self):
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            if self.socket_path and os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
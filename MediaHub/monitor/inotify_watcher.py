@@ -0,0 +1,230 @@
+import os
+import sys
+import time
+import errno
+import select
+import struct
+import ctypes
+import ctypes.util
+from stat import S_ISLNK, S_ISREG
+from MediaHub.utils.logging_utils import log_message
+
+# inotify event masks from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+
+# Filesystems where the kernel does not see remote changes, so inotify stays silent
+UNSUPPORTED_FILESYSTEMS = ('fuse', 'fuse.rclone', 'fuseblk', 'nfs', 'nfs4', 'cifs', 'smb3', 'smbfs', '9p', 'sshfs', 'fuse.sshfs', 'davfs', 'fuse.mergerfs')
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+_libc = None
+
+def _load_libc():
+    global _libc
+    if _libc is None:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        libc.inotify_init1.argtypes = [ctypes.c_int]
+        libc.inotify_init1.restype = ctypes.c_int
+        libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        libc.inotify_add_watch.restype = ctypes.c_int
+        libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        libc.inotify_rm_watch.restype = ctypes.c_int
+        _libc = libc
+    return _libc
+
+def _is_link(path):
+    """True for a symlink or a hardlink to an existing file, which appear already complete."""
+    try:
+        stat = os.lstat(path)
+    except OSError:
+        return False
+    return S_ISLNK(stat.st_mode) or (S_ISREG(stat.st_mode) and stat.st_nlink > 1)
+
+def is_inotify_available():
+    """Return True when running on Linux with a libc that exposes inotify."""
+    if not sys.platform.startswith('linux'):
+        return False
+    try:
+        libc = _load_libc()
+        return hasattr(libc, 'inotify_init1')
+    except (OSError, AttributeError):
+        return False
+
+def get_filesystem_type(path):
+    """Return the filesystem type of the mount containing path, read from /proc/mounts."""
+    path = os.path.realpath(path)
+    best_mount, best_type = '', None
+    try:
+        with open('/proc/mounts') as mounts:
+            for line in mounts:
+                fields = line.split()
+                if len(fields) < 3:
+                    continue
+                mount_point = fields[1].replace('\\040', ' ')
+                if (path == mount_point or path.startswith(mount_point.rstrip('/') + '/')) and len(mount_point) >= len(best_mount):
+                    best_mount, best_type = mount_point, fields[2]
+    except OSError:
+        return None
+    return best_type
+
+def supports_inotify(path):
+    """Return False for FUSE, rclone and network mounts where change events are not delivered."""
+    fs_type = get_filesystem_type(path)
+    if fs_type is None:
+        return True
+    return not (fs_type in UNSUPPORTED_FILESYSTEMS or fs_type.startswith('fuse'))
+
+class InotifyWatcher:
+    """
+    Recursive inotify watcher built on ctypes. Every directory below a watched root gets its
+    own watch; new subdirectories are watched as they appear. Events are read in batches and
+    reported as sets of added and removed paths.
+    """
+
+    def __init__(self):
+        self._libc = _load_libc()
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, f"inotify_init1 failed: {os.strerror(err)}")
+        self._watches = {}
+        self._paths = {}
+
+    def _add_watch(self, path):
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                log_message("inotify watch limit reached; raise fs.inotify.max_user_watches to watch the whole library", level="WARNING")
+            raise OSError(err, f"inotify_add_watch failed for {path}: {os.strerror(err)}")
+        self._watches[wd] = path
+        self._paths[path] = wd
+        return wd
+
+    def watch_tree(self, root):
+        """Watch root and every directory below it. Returns False if any watch could not be added."""
+        pending_dirs = [root]
+        while pending_dirs:
+            directory = pending_dirs.pop()
+            try:
+                self._add_watch(directory)
+            except OSError as e:
+                if directory == root or e.errno == errno.ENOSPC:
+                    log_message(f"Unable to watch {directory}: {e}", level="WARNING")
+                    return False
+                continue
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            pending_dirs.append(entry.path)
+            except OSError as e:
+                log_message(f"Error scanning {directory} for watches: {e}", level="WARNING")
+        log_message(f"Watching {root} with inotify ({len(self._paths)} directories watched)", level="DEBUG")
+        return True
+
+    def unwatch_tree(self, root):
+        """Remove the watches of root and every directory below it."""
+        prefix = root.rstrip(os.sep) + os.sep
+        for path in [path for path in self._paths if path == root or path.startswith(prefix)]:
+            wd = self._paths.pop(path)
+            self._watches.pop(wd, None)
+            self._libc.inotify_rm_watch(self.fd, wd)
+
+    def _read_events(self):
+        events = []
+        while True:
+            try:
+                data = os.read(self.fd, 65536)
+            except BlockingIOError:
+                break
+            if not data:
+                break
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                wd, mask, cookie, length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+                offset += length
+                events.append((wd, mask, name))
+        return events
+
+    def poll(self, timeout, settle=1.0):
+        """
+        Wait up to timeout seconds for events, then keep collecting for settle seconds so a
+        burst of events is handled as one batch. Returns (added, removed, overflowed).
+        """
+        added = set()
+        removed = set()
+        overflowed = False
+
+        readable, _, _ = select.select([self.fd], [], [], max(0, timeout))
+        if not readable:
+            return added, removed, overflowed
+
+        deadline = time.monotonic() + settle
+        while True:
+            for wd, mask, name in self._read_events():
+                if mask & IN_Q_OVERFLOW:
+                    overflowed = True
+                    continue
+
+                directory = self._watches.get(wd)
+                if directory is None:
+                    continue
+
+                if mask & IN_IGNORED:
+                    self._watches.pop(wd, None)
+                    if self._paths.get(directory) == wd:
+                        del self._paths[directory]
+                    continue
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    continue
+
+                path = os.path.join(directory, name)
+                if mask & (IN_MOVED_FROM | IN_DELETE):
+                    if mask & IN_ISDIR:
+                        self.unwatch_tree(path)
+                    added.discard(path)
+                    removed.add(path)
+                elif mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    # Watch the new directory before reporting it so files written into it are seen
+                    self.watch_tree(path)
+                    removed.discard(path)
+                    added.add(path)
+                elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO) or (mask & IN_CREATE and _is_link(path)):
+                    # Plain files are reported once fully written, not when first created;
+                    # symlinks and hardlinks only ever raise IN_CREATE
+                    removed.discard(path)
+                    added.add(path)
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            readable, _, _ = select.select([self.fd], [], [], remaining)
+            if not readable:
+                break
+
+        return added, removed, overflowed
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+        self._watches.clear()
+        self._paths.clear()
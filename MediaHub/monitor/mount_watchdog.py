@@ -0,0 +1,91 @@
+import time
+import threading
+import concurrent.futures
+from MediaHub.utils.logging_utils import log_message
+
+def run_in_daemon_thread(func, *args, name=None):
+    """
+    Run func on a fresh daemon thread and return a Future for its result.
+    Unlike executor workers, a thread stuck on a dead mount does not block interpreter exit.
+    """
+    future = concurrent.futures.Future()
+
+    def runner():
+        try:
+            future.set_result(func(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=runner, name=name, daemon=True).start()
+    return future
+
+class MountWatchdog(threading.Thread):
+    """
+    Background thread that probes every source root with a hard timeout and caches the
+    verdict. Callers read the cached verdict without touching the mount, so a dead FUSE
+    mount can only ever stall a probe worker, never the caller.
+    """
+
+    def __init__(self, roots, probe, interval, probe_timeout, ttl=None):
+        super().__init__(name="mount-watchdog", daemon=True)
+        self.roots = list(roots)
+        self.probe = probe
+        self.interval = max(1, interval)
+        self.probe_timeout = probe_timeout
+        self.ttl = ttl if ttl is not None else self.interval * 3 + probe_timeout
+        self._verdicts = {}
+        self._probes = {}
+        self._stop_event = threading.Event()
+        self.first_round = threading.Event()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            self.probe_all()
+            self.first_round.set()
+            self._stop_event.wait(self.interval)
+
+    def probe_all(self):
+        """Probe every root concurrently and record the verdicts."""
+        futures = {}
+        for root in self.roots:
+            running = self._probes.get(root)
+            if running is not None and not running.done():
+                # The previous probe is still stuck on this mount
+                self._record(root, False, "probe still blocked")
+                continue
+            futures[root] = self._probes[root] = run_in_daemon_thread(self.probe, root, name="mount-probe")
+
+        deadline = time.monotonic() + self.probe_timeout
+        for root, future in futures.items():
+            try:
+                healthy = bool(future.result(timeout=max(0, deadline - time.monotonic())))
+                self._record(root, healthy, None if healthy else "not mounted or unhealthy")
+            except concurrent.futures.TimeoutError:
+                self._record(root, False, f"probe timed out after {self.probe_timeout:g}s")
+            except Exception as e:
+                self._record(root, False, str(e))
+
+    def _record(self, root, healthy, reason):
+        previous = self._verdicts.get(root)
+        self._verdicts[root] = (healthy, time.monotonic())
+        if previous is None or previous[0] != healthy:
+            if healthy:
+                log_message(f"Mount is now available: {root}", level="INFO")
+            else:
+                log_message(f"Mount is not available: {root} ({reason})", level="WARNING")
+
+    def is_healthy(self, root=None):
+        """Return the cached verdict for one root, or whether any root is healthy when root is None."""
+        now = time.monotonic()
+        roots = [root] if root is not None else self.roots
+        for path in roots:
+            verdict = self._verdicts.get(path)
+            if verdict is not None and verdict[0] and now - verdict[1] <= self.ttl:
+                return True
+        return False
+
+    def get_verdicts(self):
+        return {root: verdict[0] for root, verdict in self._verdicts.items()}
+
+    def stop(self):
+        self._stop_event.set()
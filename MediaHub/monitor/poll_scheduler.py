@@ -0,0 +1,60 @@
+import threading
+from MediaHub.utils.logging_utils import log_message
+
+class PollScheduler:
+    """
+    Adaptive polling interval. The interval drops to the minimum as soon as a cycle finds
+    changes and doubles after every idle cycle up to the maximum. It never falls below a
+    few times the observed scan cost, so slow mounts are not kept permanently busy.
+    """
+
+    def __init__(self, initial_interval, min_interval, max_interval, backoff=2.0, cost_factor=4.0):
+        self.min_interval = max(0.1, min_interval)
+        self.max_interval = max(self.min_interval, max_interval)
+        self.backoff = backoff
+        self.cost_factor = cost_factor
+        self.interval = min(self.max_interval, max(self.min_interval, initial_interval))
+        self.lock = threading.Lock()
+        self.metrics = {
+            'cycles': 0,
+            'active_cycles': 0,
+            'idle_streak': 0,
+            'last_scan_seconds': 0.0,
+            'avg_scan_seconds': 0.0,
+            'total_scan_seconds': 0.0,
+        }
+
+    def record_cycle(self, changes, scan_seconds):
+        """Record a poll cycle's change count and duration, then return the next interval."""
+        with self.lock:
+            metrics = self.metrics
+            metrics['cycles'] += 1
+            metrics['last_scan_seconds'] = scan_seconds
+            metrics['total_scan_seconds'] += scan_seconds
+            # Exponentially weighted so the floor follows the mount's current latency
+            if metrics['cycles'] == 1:
+                metrics['avg_scan_seconds'] = scan_seconds
+            else:
+                metrics['avg_scan_seconds'] = 0.8 * metrics['avg_scan_seconds'] + 0.2 * scan_seconds
+
+            previous = self.interval
+            if changes:
+                metrics['active_cycles'] += 1
+                metrics['idle_streak'] = 0
+                self.interval = self.min_interval
+            else:
+                metrics['idle_streak'] += 1
+                self.interval = min(self.max_interval, self.interval * self.backoff)
+
+            self.interval = min(self.max_interval, max(self.interval, metrics['avg_scan_seconds'] * self.cost_factor))
+            interval = self.interval
+
+        if interval != previous:
+            log_message(f"Polling interval adjusted from {previous:.1f}s to {interval:.1f}s (scan took {scan_seconds:.2f}s)", level="DEBUG")
+        return interval
+
+    def get_metrics(self):
+        with self.lock:
+            metrics = dict(self.metrics)
+            metrics['current_interval'] = self.interval
+        return metrics
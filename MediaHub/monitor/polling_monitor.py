@@ -1,8 +1,11 @@
 import os
+import json
 import time
 import subprocess
 import logging
 import sys
+import threading
+import concurrent.futures
 from dotenv import load_dotenv, find_dotenv
 
 # Append the parent directory to the system path
@@ -13,6 +16,12 @@ sys.path.append(base_dir)
 from MediaHub.processors.db_utils import *
 from MediaHub.config.config import *
 from MediaHub.processors.symlink_creator import *
+from MediaHub.monitor.inotify_watcher import InotifyWatcher, is_inotify_available, supports_inotify
+from MediaHub.monitor.tree_snapshot import TreeSnapshot
+from MediaHub.monitor.settle_queue import SettleQueue
+from MediaHub.monitor.poll_scheduler import PollScheduler
+from MediaHub.monitor.mount_watchdog import MountWatchdog, run_in_daemon_thread
+from MediaHub.monitor.ingest_server import IngestServer
 
 # Load .env file from the parent directory
 dotenv_path = find_dotenv('../.env')
@@ -97,10 +106,12 @@ def verify_mount_health(directory):
 def verify_rclone_mount(directory):
     """
     Verifies if the directory is under a mount and checks mount health.
+    This touches the mount directly and may block on a dead FUSE mount, so it is only
+    called from the mount watchdog's probe workers.
+    A directory that is not under a mount point has no mount to verify, so it is reported
+    as healthy as long as it exists.
     Returns tuple: (is_mounted, is_healthy)
     """
-    global mount_state
-
     if not os.path.exists(directory):
         return False, False
 
@@ -108,27 +119,37 @@ def verify_rclone_mount(directory):
 
     if is_mounted and mount_point:
         is_healthy = verify_mount_health(directory)
-
-        if is_healthy:
-            if mount_state != True:
-                log_message(f"Mount is now available: {mount_point}", level="INFO")
-                mount_state = True
-            return True, True
-        else:
-            if mount_state is not False:
-                log_message(f"Mount has become unresponsive: {mount_point}", level="WARNING")
-                mount_state = False
-            return False, False
-    else:
-        if mount_state is not False:
-            log_message(f"Mount is not available: {directory}", level="WARNING")
-            mount_state = False
-        return False, False
-
-def check_rclone_mount():
+        return is_healthy, is_healthy
+    log_message(f"Source directory is not under a mount point, skipping mount check: {directory}", level="DEBUG")
+    return False, True
+
+def probe_mount(directory):
+    return verify_rclone_mount(directory)[1]
+
+mount_watchdog = None
+mount_watchdog_lock = threading.Lock()
+
+def get_mount_watchdog():
+    """Start the mount watchdog on first use and wait briefly for its first verdicts."""
+    global mount_watchdog
+    with mount_watchdog_lock:
+        if mount_watchdog is None:
+            src_dirs, _ = get_directories()
+            if not src_dirs:
+                log_message("No source directories configured in environment", level="ERROR")
+                return None
+            probe_timeout = get_mount_probe_timeout()
+            mount_watchdog = MountWatchdog(src_dirs, probe_mount, is_mount_check_interval(), probe_timeout)
+            mount_watchdog.start()
+            mount_watchdog.first_round.wait(probe_timeout + 1)
+    return mount_watchdog
+
+def check_rclone_mount(directory=None):
     """
     Checks if the mount is available and healthy.
-    Returns True if either RCLONE_MOUNT is False or if the mount is verified.
+    Returns True if either RCLONE_MOUNT is False or if the cached watchdog verdict is healthy,
+    for the given source directory or for any source directory when none is given, so one
+    root being down does not hold back the others.
     """
     global mount_state
 
@@ -138,183 +159,238 @@ def check_rclone_mount():
             mount_state = False
         return True
 
-    src_dirs, _ = get_directories()
-    if not src_dirs:
-        log_message("No source directories configured in environment", level="ERROR")
+    watchdog = get_mount_watchdog()
+    if watchdog is None:
         return False
+    return watchdog.is_healthy(directory)
 
-    directory = src_dirs[0]
+# Expired TMDB cache entries are pruned at most this often
+TMDB_CACHE_PRUNE_INTERVAL = 3600
+last_tmdb_cache_prune = 0
 
-    try:
-        is_mounted, is_healthy = verify_rclone_mount(directory)
-        return is_mounted and is_healthy
+# Scans that overran their deadline keep running here; their results are collected later
+running_scans = {}
+degraded_roots = set()
 
-    except Exception as e:
-        if mount_state is not False:
-            log_message(f"Error checking mount: {str(e)}", level="ERROR")
-            mount_state = False
-        return False
+def scan_root(directory, snapshot):
+    """Diff one source root against the snapshot. Runs on a scan worker."""
+    if not os.path.exists(directory):
+        log_message(f"Watch directory not found: {directory}", level="ERROR")
+        return [], []
+    return snapshot.diff(directory)
 
-def scan_directories(dirs_to_watch, current_files, last_mod_times=None):
+def scan_directories(dirs_to_watch, snapshot, timeout=None):
     """
-    Scans directories for new or removed files and tracks directory modifications.
+    Scans directories recursively for new or removed files against the tree snapshot.
+    Each root is scanned in its own worker with a deadline; a root that overruns it is marked
+    degraded and skipped until its scan finishes, so one hung remote cannot stall the others.
     Args:
         dirs_to_watch (list): Directories to monitor
-        current_files (dict): Current known files in directories
-        last_mod_times (dict, optional): Last known modification times for directories
+        snapshot (TreeSnapshot): Snapshot of the watched trees, updated in place. It is not
+            saved here; checkpoint_monitor persists it once the changes have been handled,
+            so a crash mid-batch re-reports them on restart
+        timeout (float, optional): Per-cycle deadline in seconds
     Returns:
-        tuple: (new_files, modified_dirs, updated_last_mod_times)
+        tuple: (added_paths, removed_paths)
     """
-    if last_mod_times is None:
-        last_mod_times = {}
-
-    new_files = {}
-    modified_dirs = {}
-
-    for directory in dirs_to_watch:
-        log_message(f"Scanning directory: {directory}", level="DEBUG")
+    if timeout is None:
+        timeout = get_monitor_scan_timeout()
 
-        if not os.path.exists(directory):
-            log_message(f"Watch directory not found: {directory}", level="ERROR")
-            continue
+    added_paths = []
+    removed_paths = []
 
+    def collect(directory, future):
         try:
-            dir_entries = os.listdir(directory)
-            new_files[directory] = set(dir_entries)
-
-            for entry in dir_entries:
-                full_path = os.path.join(directory, entry)
-
-                if os.path.isdir(full_path):
-                    try:
-                        dir_stat = os.stat(full_path)
-                        current_mod_time = dir_stat.st_mtime
-
-                        mod_key = full_path
-
-                        if mod_key in last_mod_times:
-                            if current_mod_time > last_mod_times[mod_key]:
-                                log_message(f"Top-level Subdirectory Modified: {full_path}", level="DEBUG")
-                                modified_dirs[full_path] = {
-                                    'old_mod_time': last_mod_times[mod_key],
-                                    'new_mod_time': current_mod_time
-                                }
-
-                        last_mod_times[mod_key] = current_mod_time
-
-                    except Exception as e:
-                        log_message(f"Error checking subdirectory {full_path}: {str(e)}", level="ERROR")
-
+            added, removed = future.result()
+            added_paths.extend(added)
+            removed_paths.extend(removed)
         except Exception as e:
             log_message(f"Failed to scan directory {directory}: {str(e)}", level="ERROR")
-            continue
+        if directory in degraded_roots:
+            degraded_roots.discard(directory)
+            log_message(f"Source directory responsive again: {directory}", level="INFO")
 
-    return new_files, modified_dirs, last_mod_times
+    futures = {}
+    for directory in dirs_to_watch:
+        running = running_scans.get(directory)
+        if running is not None:
+            if not running.done():
+                log_message(f"Previous scan of {directory} is still running, skipping it this cycle", level="WARNING")
+                continue
+            # A late scan already updated the snapshot, so its changes must still be reported
+            del running_scans[directory]
+            collect(directory, running)
 
-def process_changes(current_files, new_files, dest_dir, modified_dirs=None):
+        log_message(f"Scanning directory: {directory}", level="DEBUG")
+        # Daemon threads rather than an executor, so a scan hung on a dead mount cannot block exit
+        futures[run_in_daemon_thread(scan_root, directory, snapshot, name="monitor-scan")] = directory
+
+    done, not_done = concurrent.futures.wait(futures, timeout=timeout)
+    for future in done:
+        collect(futures[future], future)
+    for future in not_done:
+        directory = futures[future]
+        running_scans[directory] = future
+        if directory not in degraded_roots:
+            degraded_roots.add(directory)
+            log_message(f"Scan of {directory} exceeded {timeout:.0f}s, marking it degraded and skipping it this cycle", level="WARNING")
+
+    if added_paths:
+        log_message(f"New files detected: {added_paths}", level="INFO")
+    if removed_paths:
+        log_message(f"Detected {len(removed_paths)} removed files: {removed_paths}", level="INFO")
+
+    return added_paths, removed_paths
+
+def process_events(added_paths, removed_paths, dest_dir, engine):
     """
-    Updated process_changes to create symlinks for added files.
+    Shared handling for changes reported by polling or by the inotify watcher.
+    Removed paths have their broken symlinks cleaned up; added paths not yet in the
+    database are submitted to the symlink engine as one batch.
     """
-    src_dirs, _ = get_directories()
-
-    if modified_dirs:
-        for mod_dir, mod_details in modified_dirs.items():
-            try:
-                current_dir_files = set(os.listdir(mod_dir))
-
-                db_results = search_database_silent(mod_dir)
-
-                db_file_names = set(os.path.basename(result[0]) for result in db_results)
-
-                # Find added and removed files
-                added_files = current_dir_files - db_file_names
-                removed_files = db_file_names - current_dir_files
-
-                # Process added files
-                if added_files:
-                    for added_file in added_files:
-                        file_path = os.path.join(mod_dir, added_file)
-                        log_message(f"Processing new file: {file_path}", level="INFO")
-                        try:
-                            create_symlinks(src_dirs=src_dirs, dest_dir=dest_dir, auto_select=True, single_path=file_path, force=False, mode='monitor')
-                        except Exception as e:
-                            log_message(f"Error creating symlink for {file_path}: {str(e)}", level="ERROR")
-
-                if removed_files:
-                    for removed_file in removed_files:
-                        removed_file_path = os.path.join(mod_dir, removed_file)
-                        log_message(f"Checking for broken symlink for removed file: {removed_file_path}", level="INFO")
-                        delete_broken_symlinks(dest_dir, removed_file_path)
-
-            except Exception as e:
-                log_message(f"Error processing modified directory {mod_dir}: {str(e)}", level="ERROR")
-
-    for directory, files in new_files.items():
-        old_files = current_files.get(directory, set())
-        added_files = files - old_files
-        removed_files = old_files - files
-
-        if added_files:
-            log_message(f"New files detected in {directory}: {added_files}", level="INFO")
-            for file in added_files:
-                if file != 'version.txt':
-                    full_path = os.path.join(directory, file)
-                    log_message(f"Processing new file: {full_path}", level="INFO")
-                    process_file(full_path)
-                else:
-                    log_message("Skipping version.txt file processing", level="DEBUG")
+    for removed_path in removed_paths:
+        log_message(f"Checking for broken symlink for removed file: {removed_path}", level="DEBUG")
+        delete_broken_symlinks(dest_dir, removed_path)
+
+    added_dirs = [path.rstrip(os.sep) + os.sep for path in added_paths if os.path.isdir(path)]
+    pending_paths = []
+    for path in added_paths:
+        if os.path.basename(path) == 'version.txt':
+            log_message("Skipping version.txt file processing", level="DEBUG")
+            continue
+        # Files inside a newly added directory are picked up when the directory is walked
+        if any(path.startswith(added_dir) for added_dir in added_dirs):
+            continue
+        if check_file_in_db(path):
+            log_message(f"File already exists in the database: {path}", level="DEBUG")
+            continue
+        log_message(f"Processing new file: {path}", level="INFO")
+        pending_paths.append(path)
 
-        if removed_files:
-            log_message(f"Detected {len(removed_files)} removed files from {directory}: {removed_files}", level="INFO")
-            for removed_file in removed_files:
-                removed_file_path = os.path.join(directory, removed_file)
-                log_message(f"Checking for broken symlink for removed file: {removed_file_path}", level="DEBUG")
-                delete_broken_symlinks(dest_dir, removed_file_path)
+    if pending_paths:
+        process_files(pending_paths, engine)
 
-def process_file(file_path):
+def process_files(file_paths, engine):
     """
-    Processes individual files by checking the database and creating symlinks.
+    Processes new files by handing them to the long-lived symlink engine.
     Only handles the symlink creation without triggering the full main function.
     """
-    if not check_file_in_db(file_path):
-        log_message(f"File not found in database. Initiating processing for: {file_path}", level="INFO")
-
-        try:
-            # Get source and destination directories
-            src_dirs, dest_dir = get_directories()
-            if not src_dirs or not dest_dir:
-                log_message("Source or destination directory not set in environment variables", level="ERROR")
-                return
-
-            # Call create_symlinks with the specific file path
-            create_symlinks(src_dirs=src_dirs, dest_dir=dest_dir, auto_select=True, single_path=file_path, force=False, mode='monitor')
-            log_message(f"Symlink monitoring completed for {file_path}", level="INFO")
-
-        except Exception as e:
-            log_message(f"Failed to process file: {file_path}. Error: {e}", level="ERROR")
-    else:
-        log_message(f"File already exists in the database: {file_path}", level="WARNING")
+    try:
+        engine.wait(engine.submit(file_paths))
+        log_message(f"Symlink monitoring completed for {len(file_paths)} new paths", level="INFO")
+    except Exception as e:
+        log_message(f"Failed to process files: {file_paths}. Error: {e}", level="ERROR")
 
 def initial_scan(dirs_to_watch):
     """Performs an initial scan of directories to capture the current state of files."""
     log_message("Starting initial directory scan", level="INFO")
-    current_files = {}
+    snapshot = TreeSnapshot(dirs_to_watch)
 
     for directory in dirs_to_watch:
         log_message(f"Performing initial scan of directory: {directory}", level="DEBUG")
 
         if os.path.exists(directory):
             try:
-                files = set(os.listdir(directory))
-                current_files[directory] = files
-                log_message(f"Initial scan found {len(files)} files in {directory}", level="INFO")
+                known_dirs = len(snapshot.dirs)
+                snapshot.build(directory)
+                log_message(f"Initial scan found {len(snapshot.dirs) - known_dirs} directories in {directory}", level="INFO")
             except Exception as e:
                 log_message(f"Error during initial scan of {directory}: {str(e)}", level="ERROR")
         else:
             log_message(f"Directory not found during initial scan: {directory}", level="ERROR")
 
+    snapshot.save()
     log_message("Initial directory scan completed", level="INFO")
-    return current_files
+    return snapshot
+
+def restore_snapshot(dirs_to_watch):
+    """
+    Resume from the snapshot checkpointed by a previous run instead of scanning from scratch.
+    The trees are diffed against the checkpoint so changes made while the monitor was down
+    are reconciled, and paths that were still settling at the checkpoint are reported again.
+    Returns (snapshot, added_paths, removed_paths), or None without a checkpoint.
+    """
+    state = get_monitor_state()
+    if not state.get('last_checkpoint'):
+        return None
+
+    snapshot = TreeSnapshot(dirs_to_watch)
+    if not snapshot.load():
+        return None
+
+    checkpoint_time = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(float(state['last_checkpoint'])))
+    log_message(f"Resuming from monitor checkpoint taken at {checkpoint_time}, reconciling changes since then", level="INFO")
+    added, removed = scan_directories(dirs_to_watch, snapshot)
+    try:
+        pending = json.loads(state.get('pending_paths') or '[]')
+    except ValueError:
+        pending = []
+    replayed = [path for path in pending if path not in added and os.path.exists(path)]
+    if replayed:
+        log_message(f"Replaying {len(replayed)} paths that were still settling at the last checkpoint", level="INFO")
+        added.extend(replayed)
+    log_message(f"Reconciled {len(added)} added and {len(removed)} removed paths since the last checkpoint", level="INFO")
+    return snapshot, added, removed
+
+def checkpoint_monitor(snapshot, scheduler, pending_paths=()):
+    """
+    Record the checkpoint time, polling and write throttle metrics and the paths still
+    waiting in the settle queue, then persist changed snapshot directories. The pending
+    paths are written first so a path the snapshot already knows about is never lost by
+    a restart. Old journal events and, at most hourly, expired TMDB cache entries are pruned.
+    """
+    global last_tmdb_cache_prune
+    metrics = scheduler.get_metrics()
+    throttle_stats = get_throttle_stats()
+    save_monitor_state({
+        'last_checkpoint': time.time(),
+        'poll_interval': round(metrics['current_interval'], 2),
+        'last_scan_seconds': round(metrics['last_scan_seconds'], 3),
+        'avg_scan_seconds': round(metrics['avg_scan_seconds'], 3),
+        'degraded_roots': os.pathsep.join(sorted(degraded_roots)),
+        'pending_paths': json.dumps(sorted(pending_paths)),
+        'throttled_calls': throttle_stats['throttled_calls'],
+        'throttle_wait_seconds': round(throttle_stats['wait_time'], 3),
+        'contention_events': throttle_stats['contention_events'],
+        'write_busy_seconds': round(throttle_stats['busy_time'], 3),
+    })
+    snapshot.save()
+    prune_events(get_event_retention())
+
+    if time.monotonic() - last_tmdb_cache_prune >= TMDB_CACHE_PRUNE_INTERVAL:
+        last_tmdb_cache_prune = time.monotonic()
+        pruned = prune_tmdb_cache()
+        if pruned:
+            log_message(f"Pruned {pruned} expired TMDB cache entries", level="DEBUG")
+
+def setup_watcher(src_dirs):
+    """
+    Watch every source directory that supports inotify.
+    Returns (watcher, polled_dirs) where polled_dirs still need scan_directories polling,
+    e.g. FUSE/rclone mounts or trees where a watch could not be added.
+    """
+    if not is_inotify_monitor_enabled() or not is_inotify_available():
+        return None, list(src_dirs)
+
+    try:
+        watcher = InotifyWatcher()
+    except OSError as e:
+        log_message(f"inotify unavailable, falling back to polling: {e}", level="WARNING")
+        return None, list(src_dirs)
+
+    polled_dirs = []
+    for directory in src_dirs:
+        if os.path.isdir(directory) and supports_inotify(directory) and watcher.watch_tree(directory):
+            log_message(f"Watching for changes with inotify: {directory}", level="INFO")
+        else:
+            watcher.unwatch_tree(directory)
+            log_message(f"inotify not supported for {directory}, falling back to polling", level="INFO")
+            polled_dirs.append(directory)
+
+    if len(polled_dirs) == len(src_dirs):
+        watcher.close()
+        return None, polled_dirs
+    return watcher, polled_dirs
 
 def main():
     """Main function to monitor directories and process file changes in real-time."""
@@ -327,6 +403,12 @@ def main():
     # Load previously processed files from the database
     load_processed_files()
 
+    # Make sure the symlink index schema is up to date
+    initialize_file_database()
+
+    # Keep an in-memory membership filter so unseen files skip the database lookup
+    enable_path_filter()
+
     # Get source and destination directories from environment variables
     src_dirs, dest_dir = get_directories()
     if not src_dirs or not dest_dir:
@@ -336,34 +418,131 @@ def main():
     # Get configuration from environment
     sleep_time = int(os.getenv('SLEEP_TIME', 60))
 
-    current_files = {}
-    last_mod_times = {}
+    # Keep the processed set, indexes and worker pool alive for the monitor's lifetime
+    engine = SymlinkEngine(dest_dir, auto_select=True)
+
+    # Poll faster while changes are arriving and back off while the library is idle
+    scheduler = PollScheduler(sleep_time, get_min_poll_interval(), get_max_poll_interval())
+
+    # New paths wait here until their size and mtime stop changing
+    settle_queue = SettleQueue(get_monitor_settle_seconds())
+
+    def queue_changes(added, removed):
+        settle_queue.discard(removed)
+        if removed:
+            process_events([], removed, dest_dir, engine)
+        settle_queue.add(added)
+
+    snapshot = None
+    initialized = False
+    watcher = None
+    polled_dirs = list(src_dirs)
+    next_poll = 0
+
+    def get_status():
+        return {
+            'polling': scheduler.get_metrics(),
+            'polled_dirs': polled_dirs,
+            'watched_dirs': [directory for directory in src_dirs if directory not in polled_dirs] if watcher else [],
+            'degraded_dirs': sorted(degraded_roots),
+            'settling': len(settle_queue),
+            'engine': dict(engine.stats),
+        }
+
+    # Let downloaders push finished paths straight into the engine
+    ingest_server = None
+    ingest_port, ingest_socket = get_ingest_port(), get_ingest_socket()
+    if ingest_port or ingest_socket:
+        try:
+            ingest_server = IngestServer(src_dirs, lambda paths: process_events(paths, [], dest_dir, engine), get_status,
+                                         host=get_ingest_host(), port=ingest_port, socket_path=ingest_socket)
+            ingest_server.start()
+        except OSError as e:
+            log_message(f"Unable to start monitor ingest endpoint: {e}", level="ERROR")
+            ingest_server = None
     while True:
         try:
-            # Check if rclone mount is available (if enabled)
-            if not check_rclone_mount():
+            # Check if any rclone mount is available (if enabled) from the watchdog's cached verdicts
+            if not any(check_rclone_mount(directory) for directory in src_dirs):
                 if mount_state is not False:
                     log_message("Mount not available, waiting for rclone mount...", level="INFO")
                     mount_state = False
                 time.sleep(is_mount_check_interval())
                 continue
 
-            # If this is our first successful mount check, do initial scan
-            if not current_files:
-                current_files = initial_scan(src_dirs)
+            # If this is our first successful mount check, set up watches and restore or build the snapshot
+            if not initialized:
+                watcher, polled_dirs = setup_watcher(src_dirs)
+                restored = restore_snapshot(src_dirs)
+                if restored:
+                    snapshot, added, removed = restored
+                    queue_changes(added, removed)
+                else:
+                    snapshot = initial_scan(src_dirs)
+                checkpoint_monitor(snapshot, scheduler, settle_queue.paths())
+                initialized = True
+                next_poll = time.monotonic() + scheduler.interval
                 log_message("Initial scan after mount verification completed, Monitor Service is Running", level="INFO")
 
-            # Normal directory monitoring
-            log_message("Performing regular directory scan", level="DEBUG")
-            new_files, modified_dirs, last_mod_times = scan_directories(src_dirs, current_files, last_mod_times)
-            process_changes(current_files, new_files, dest_dir, modified_dirs)
-            current_files = new_files
-
-            log_message(f"Sleeping for {sleep_time} seconds", level="DEBUG")
-            time.sleep(sleep_time)
+            # Directories without inotify support are polled on the adaptive interval
+            if polled_dirs and time.monotonic() >= next_poll:
+                log_message("Performing regular directory scan", level="DEBUG")
+                refresh_path_filter()
+                scan_started = time.monotonic()
+                # Roots whose mount is currently unhealthy are left for a later cycle
+                added, removed = scan_directories([directory for directory in polled_dirs if check_rclone_mount(directory)], snapshot)
+                scan_seconds = time.monotonic() - scan_started
+                queue_changes(added, removed)
+                next_poll = time.monotonic() + scheduler.record_cycle(len(added) + len(removed), scan_seconds)
+
+            if watcher:
+                # Block on inotify until events arrive, the next poll is due or a pending path may have settled
+                timeout = max(0, next_poll - time.monotonic()) if polled_dirs else sleep_time
+                settle_due = settle_queue.next_due()
+                if settle_due is not None:
+                    timeout = min(timeout, settle_due)
+                added, removed, overflowed = watcher.poll(timeout)
+                watched_dirs = [path for path in src_dirs if path not in polled_dirs]
+                if overflowed:
+                    # Events were lost; recover them by diffing the watched trees against the snapshot
+                    log_message("inotify event queue overflowed, rescanning watched directories", level="WARNING")
+                    rescan_dirs = watched_dirs
+                else:
+                    # A degraded root's overdue reconcile has finished; collect it and rescan the root
+                    rescan_dirs = [path for path in watched_dirs if path in running_scans and running_scans[path].done()]
+                if rescan_dirs:
+                    rescan_added, rescan_removed = scan_directories(rescan_dirs, snapshot)
+                    added.update(rescan_added)
+                    removed.update(rescan_removed)
+                if added or removed:
+                    queue_changes(sorted(added), sorted(removed))
+                    # Keep the snapshot current so a restart only reconciles real downtime changes
+                    snapshot.update(parent for parent in {os.path.dirname(path) for path in added | removed} if parent in snapshot.dirs)
+            else:
+                timeout = max(0, next_poll - time.monotonic())
+                settle_due = settle_queue.next_due()
+                if settle_due is not None:
+                    timeout = min(timeout, settle_due)
+                log_message(f"Sleeping for {timeout:.1f} seconds", level="DEBUG")
+                time.sleep(timeout)
+
+            # Hand over paths whose size and mtime held steady for the settle window
+            settled = settle_queue.ready()
+            if settled:
+                refresh_path_filter()
+                process_events(settled, [], dest_dir, engine)
+
+            checkpoint_monitor(snapshot, scheduler, settle_queue.paths())
 
         except KeyboardInterrupt:
             log_message("Received shutdown signal, exiting gracefully", level="INFO")
+            if snapshot is not None:
+                checkpoint_monitor(snapshot, scheduler, settle_queue.paths())
+            if watcher:
+                watcher.close()
+            if ingest_server:
+                ingest_server.stop()
+            engine.shutdown()
             break
         except Exception as e:
             log_message(f"Unexpected error in main loop: {str(e)}", level="ERROR")
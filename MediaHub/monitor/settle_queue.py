@@ -0,0 +1,94 @@
+import os
+import time
+from MediaHub.utils.logging_utils import log_message
+
+class SettleQueue:
+    """
+    Holds newly seen paths until their size and mtime have stayed the same for the settle
+    window, so files still being written by a downloader are not processed early.
+    All pending paths are re-checked in one pass per tick.
+    """
+
+    def __init__(self, window):
+        self.window = max(0, window)
+        self._pending = {}
+
+    def __len__(self):
+        return len(self._pending)
+
+    @staticmethod
+    def _signature(path):
+        """Return (entries, total size, newest mtime) for a file or a whole directory tree."""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if not os.path.isdir(path):
+            return 1, stat.st_size, stat.st_mtime
+
+        entries, total_size, newest_mtime = 0, 0, stat.st_mtime
+        pending_dirs = [path]
+        while pending_dirs:
+            directory = pending_dirs.pop()
+            try:
+                with os.scandir(directory) as scan:
+                    for entry in scan:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                pending_dirs.append(entry.path)
+                            entry_stat = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        entries += 1
+                        total_size += entry_stat.st_size
+                        newest_mtime = max(newest_mtime, entry_stat.st_mtime)
+            except OSError:
+                continue
+        return entries, total_size, newest_mtime
+
+    def add(self, paths):
+        now = time.monotonic()
+        for path in paths:
+            signature = self._signature(path)
+            if signature is None:
+                continue
+            previous = self._pending.get(path)
+            if previous is None or previous[0] != signature:
+                self._pending[path] = (signature, now)
+
+    def paths(self):
+        """Return the paths still waiting to settle."""
+        return list(self._pending)
+
+    def discard(self, paths):
+        for path in paths:
+            self._pending.pop(path, None)
+
+    def ready(self):
+        """Re-check every pending path and return those that have settled."""
+        if not self._pending:
+            return []
+
+        now = time.monotonic()
+        settled = []
+        for path, (signature, stable_since) in list(self._pending.items()):
+            current = self._signature(path)
+            if current is None:
+                log_message(f"Pending path disappeared before settling: {path}", level="DEBUG")
+                del self._pending[path]
+            elif current != signature:
+                self._pending[path] = (current, now)
+            elif now - stable_since >= self.window:
+                settled.append(path)
+                del self._pending[path]
+
+        if self._pending:
+            log_message(f"{len(self._pending)} paths still settling", level="DEBUG")
+        return settled
+
+    def next_due(self):
+        """Seconds until the earliest pending path could settle, or None if nothing is pending."""
+        if not self._pending:
+            return None
+        oldest = min(stable_since for _, stable_since in self._pending.values())
+        return max(0, oldest + self.window - time.monotonic())
@@ -1,6 +1,5 @@
 import os
 import re
-import traceback
 import sqlite3
 import time
 from dotenv import load_dotenv, find_dotenv
@@ -15,6 +14,8 @@ from MediaHub.config.config import *
 from MediaHub.processors.db_utils import *
 from MediaHub.utils.plex_utils import *
 from MediaHub.processors.symlink_utils import *
+from MediaHub.processors.symlink_utils import _cleanup_empty_dirs
+from MediaHub.processors.process_db import *
 
 # Load .env file from the parent directory
 dotenv_path = find_dotenv('../.env')
@@ -24,56 +25,109 @@ if not dotenv_path:
 
 load_dotenv(dotenv_path)
 
+def _list_names(directory):
+    """Return the entry names of a directory, or None if it could not be listed."""
+    try:
+        with os.scandir(directory) as entries:
+            return {entry.name for entry in entries}
+    except FileNotFoundError:
+        return set()
+    except OSError as e:
+        log_message(f"Unable to list {directory}, skipping its symlinks this cycle: {e}", level="WARNING")
+        return None
+
+def _unavailable_source_roots():
+    """Source directories that are missing or empty, e.g. an rclone mount that is down."""
+    src_dirs, _ = get_directories()
+    unavailable = []
+    for src_dir in src_dirs:
+        src_dir = os.path.normpath(src_dir)
+        if not _list_names(src_dir):
+            unavailable.append(src_dir.rstrip(os.sep) + os.sep)
+    return unavailable
+
+def _remove_broken_symlinks(broken):
+    """Remove a batch of (symlink_path, target_path) links and their database rows."""
+    removed = []
+    for symlink_path, target_path in broken:
+        try:
+            current_target = os.readlink(symlink_path)
+        except FileNotFoundError:
+            current_target = None
+        except OSError:
+            log_message(f"Indexed path is no longer a symlink, leaving it in place: {symlink_path}", level="DEBUG")
+            continue
+
+        if current_target is None:
+            log_message(f"Symlink already gone, removing database entry: {symlink_path}", level="DEBUG")
+        elif current_target != target_path and os.path.exists(symlink_path):
+            # Re-linked to a live target since the index was written
+            continue
+        else:
+            try:
+                os.remove(symlink_path)
+                log_message(f"Deleted broken symlink: {symlink_path} -> {target_path}", level="INFO")
+            except OSError as e:
+                log_message(f"Error removing symlink {symlink_path}: {e}", level="ERROR")
+                continue
+        removed.append(symlink_path)
+
+    if removed:
+        delete_processed_destinations(removed)
+        remove_file_index_entries(removed)
+        for directory in sorted({os.path.dirname(path) for path in removed}, reverse=True):
+            _cleanup_empty_dirs(directory)
+    return removed
+
 def run_symlink_cleanup(dest_dir):
-    symlinks_deleted = False
+    """
+    Remove symlinks whose targets have disappeared, driven by the file_index reverse map.
+    Indexed targets are grouped by source directory and each directory is listed once;
+    only links whose target is missing from its listing are verified and removed.
+    """
     log_message(f"Starting broken symlink cleanup in directory: {dest_dir}", level="INFO")
 
     if not os.path.exists(dest_dir):
         log_message(f"Destination directory {dest_dir} does not exist!", level="ERROR")
         return
 
-    for root, _, files in os.walk(dest_dir):
-        for file in files:
-            file_path = os.path.join(root, file)
-            if os.path.islink(file_path):
-                try:
-                    target = os.readlink(file_path)
-
-                    # Check if the symlink target exists
-                    if not os.path.exists(target):
-                        log_message(f"Broken symlink found: {file_path} -> {target}", level="INFO")
-                        symlinks_deleted = True
-
-                        # First check if the file is in the database
-                        if check_file_in_db(file_path):
-                            # Try to get the actual destination using search_database if available
-                            actual_target = None
-                            try:
-                                if 'search_database_quiet' in globals() and callable(globals()['search_database_quiet']):
-                                    search_results = search_database(file_path)
-                                    if search_results and len(search_results) > 0:
-                                        actual_target = search_results[0][0] if search_results[0][0] else target
-                                else:
-                                    log_message("Using original target path", level="DEBUG")
-                            except Exception as search_error:
-                                log_message(f"Error searching database: {str(search_error)}", level="ERROR")
-
-                            # Use actual target if found, otherwise use the original target
-                            removed_path = actual_target if actual_target else target
-                            delete_broken_symlinks(dest_dir, removed_path)
-                        else:
-                            log_message(f"Symlink not found in database, deleting directly: {file_path}", level="DEBUG")
-                            try:
-                                os.remove(file_path)
-                                log_message(f"Manually deleted broken symlink: {file_path}", level="INFO")
-                            except Exception as rm_error:
-                                log_message(f"Error removing symlink: {str(rm_error)}", level="ERROR")
-                except Exception as e:
-                    log_message(f"Error processing symlink {file_path}: {str(e)}", level="ERROR")
-                    print(f"Exception details: {traceback.format_exc()}")
+    initialize_file_database()
+    targets_by_dir = get_symlink_targets_by_dir()
+
+    # Periodically rebuild the index from the destination tree so links created outside
+    # the indexed paths (older versions, manual links, partial indexes) are still covered
+    last_reconcile = float(get_monitor_state().get('file_index_reconciled_at') or 0)
+    if not targets_by_dir or time.time() - last_reconcile >= get_file_index_reconcile_hours() * 3600:
+        log_message("Reconciling the symlink index with the destination directory.", level="INFO")
+        update_file_index(dest_dir)
+        save_monitor_state({'file_index_reconciled_at': time.time()})
+        targets_by_dir = get_symlink_targets_by_dir()
+
+    unavailable_roots = _unavailable_source_roots()
+    for root in unavailable_roots:
+        log_message(f"Source directory unavailable, skipping its symlinks: {root}", level="WARNING")
+
+    broken = []
+    removed_count = 0
+    for target_dir, links in targets_by_dir.items():
+        if any((target_dir + os.sep).startswith(root) for root in unavailable_roots):
+            continue
+        names = _list_names(target_dir)
+        if names is None:
+            continue
+        for symlink_path, target_path in links:
+            # Confirm a miss with a stat so stale directory caches cannot delete live links
+            if os.path.basename(target_path) not in names and not os.path.exists(target_path):
+                broken.append((symlink_path, target_path))
+        if len(broken) >= BATCH_SIZE:
+            removed_count += len(_remove_broken_symlinks(broken))
+            broken = []
+    if broken:
+        removed_count += len(_remove_broken_symlinks(broken))
 
+    symlinks_deleted = removed_count > 0
     if symlinks_deleted:
-        log_message("Broken symlinks deleted successfully.", level="INFO")
+        log_message(f"Deleted {removed_count} broken symlinks across {len(targets_by_dir)} source directories.", level="INFO")
     else:
         log_message("No broken symlinks found.", level="INFO")
 
@@ -82,3 +136,4 @@ def run_symlink_cleanup(dest_dir):
 
     log_message(f"Sleeping Full broken symlink deletion for {cleanup_interval} seconds until next cleanup cycle.", level="INFO")
     time.sleep(cleanup_interval)
+    return symlinks_deleted
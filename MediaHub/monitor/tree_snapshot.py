@@ -0,0 +1,168 @@
+import os
+import json
+import threading
+from MediaHub.utils.logging_utils import log_message
+from MediaHub.processors.db_utils import load_monitor_snapshot, save_monitor_snapshot
+
+class TreeSnapshot:
+    """
+    Recursive snapshot of the source trees: for every directory its mtime and the name,
+    size, mtime and type of each entry. A refresh only lists directories whose mtime
+    changed and stats the rest, so changes at any depth are found without re-walking
+    whole trees. Changed directories are persisted to the monitor_snapshot table.
+    Different roots may be diffed concurrently; the change sets are guarded by a lock
+    that is never held across filesystem calls.
+    """
+
+    def __init__(self, roots):
+        self.roots = [os.path.normpath(root) for root in roots]
+        self.dirs = {}
+        self._dirty = set()
+        self._removed = set()
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Load the persisted snapshot for every root. Returns True if anything was stored."""
+        for root in self.roots:
+            for path, (mtime, entries) in load_monitor_snapshot(root).items():
+                try:
+                    self.dirs[path] = (mtime, {name: tuple(info) for name, info in json.loads(entries).items()})
+                except (TypeError, ValueError):
+                    log_message(f"Discarding unreadable snapshot entry for {path}", level="WARNING")
+        return bool(self.dirs)
+
+    @staticmethod
+    def _list(directory):
+        """Return {name: (size, mtime, is_dir)} for a directory; symlinked directories count as files."""
+        entries = {}
+        with os.scandir(directory) as scan:
+            for entry in scan:
+                try:
+                    is_dir = entry.is_dir(follow_symlinks=False)
+                    stat = entry.stat(follow_symlinks=False)
+                    entries[entry.name] = (0 if is_dir else stat.st_size, stat.st_mtime, is_dir)
+                except OSError:
+                    continue
+        return entries
+
+    def _record(self, directory):
+        """List a directory and its whole subtree into the snapshot without reporting changes."""
+        pending_dirs = [directory]
+        while pending_dirs:
+            current = pending_dirs.pop()
+            try:
+                mtime = os.stat(current).st_mtime
+                entries = self._list(current)
+            except OSError as e:
+                log_message(f"Error scanning directory {current}: {e}", level="WARNING")
+                continue
+            self.dirs[current] = (mtime, entries)
+            with self._lock:
+                self._dirty.add(current)
+                self._removed.discard(current)
+            pending_dirs.extend(os.path.join(current, name) for name, info in entries.items() if info[2])
+
+    def _forget(self, directory):
+        """Drop a directory and everything below it from the snapshot."""
+        pending_dirs = [directory]
+        while pending_dirs:
+            current = pending_dirs.pop()
+            known = self.dirs.pop(current, None)
+            with self._lock:
+                self._dirty.discard(current)
+            if known:
+                pending_dirs.extend(os.path.join(current, name) for name, info in known[1].items() if info[2])
+        with self._lock:
+            self._removed.add(directory)
+
+    def build(self, root=None):
+        """Record the current state of one or all roots."""
+        for path in [os.path.normpath(root)] if root else self.roots:
+            self._record(path)
+
+    def diff(self, root):
+        """
+        Compare a root against the snapshot and update it. Returns (added, removed) paths.
+        New directories are reported as a single path; their contents are recorded silently.
+        A root missing from the snapshot, e.g. one that was unavailable at the initial scan,
+        is recorded and its top-level entries are reported as added.
+        """
+        root = os.path.normpath(root)
+        if root not in self.dirs:
+            self._record(root)
+            known = self.dirs.get(root)
+            return [os.path.join(root, name) for name in sorted(known[1])] if known else [], []
+        return self._diff([root], descend=True)
+
+    def update(self, directories):
+        """
+        Re-list only the given directories, e.g. the parents of paths reported by inotify,
+        so the snapshot stays current without a tree walk. Returns (added, removed) paths.
+        """
+        return self._diff(sorted({os.path.normpath(directory) for directory in directories}), descend=False)
+
+    def _diff(self, start_dirs, descend):
+        added = []
+        removed = []
+        pending_dirs = list(start_dirs)
+        while pending_dirs:
+            directory = pending_dirs.pop()
+            known = self.dirs.get(directory)
+            try:
+                mtime = os.stat(directory).st_mtime
+            except OSError as e:
+                log_message(f"Error reading directory {directory}: {e}", level="WARNING")
+                continue
+
+            if known and known[0] == mtime:
+                # Same entries as last time; only subdirectories can hold changes
+                if descend:
+                    pending_dirs.extend(os.path.join(directory, name) for name, info in known[1].items() if info[2])
+                continue
+
+            try:
+                entries = self._list(directory)
+            except OSError as e:
+                log_message(f"Error scanning directory {directory}: {e}", level="WARNING")
+                continue
+
+            old_entries = known[1] if known else {}
+            for name, info in entries.items():
+                path = os.path.join(directory, name)
+                previous = old_entries.get(name)
+                if previous is None or previous[2] != info[2]:
+                    if previous is not None and previous[2]:
+                        self._forget(path)
+                    added.append(path)
+                    if info[2]:
+                        self._record(path)
+                elif info[2] and descend:
+                    pending_dirs.append(path)
+
+            for name, info in old_entries.items():
+                current = entries.get(name)
+                if current is None or current[2] != info[2]:
+                    path = os.path.join(directory, name)
+                    removed.append(path)
+                    if info[2] and current is None:
+                        self._forget(path)
+
+            self.dirs[directory] = (mtime, entries)
+            with self._lock:
+                self._dirty.add(directory)
+
+        return added, removed
+
+    def save(self):
+        """Persist directories changed since the last save."""
+        with self._lock:
+            if not self._dirty and not self._removed:
+                return
+            dirty, self._dirty = self._dirty, set()
+            removed, self._removed = self._removed, set()
+        rows = []
+        for path in dirty:
+            known = self.dirs.get(path)
+            if known:
+                rows.append((path, known[0], json.dumps(known[1])))
+        save_monitor_snapshot(rows, sorted(removed))
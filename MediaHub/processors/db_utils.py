@@ -2,6 +2,8 @@ import sqlite3
 import os
 import time
 import threading
+import queue
+import atexit
 import sys
 import concurrent.futures
 import csv
@@ -24,6 +26,7 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__fil
 DB_DIR = os.path.join(BASE_DIR, "db")
 DB_FILE = os.path.join(DB_DIR, "processed_files.db")
 ARCHIVE_DB_FILE = os.path.join(DB_DIR, "processed_files_archive.db")
+TMDB_CACHE_DB_FILE = os.path.join(DB_DIR, "tmdb_cache.db")
 MAX_RECORDS = 100000
 LOCK_FILE = os.path.join(DB_DIR, "db_initialized.lock")
 
@@ -33,6 +36,9 @@ MAX_RETRIES = int(os.getenv('DB_MAX_RETRIES', 3))
 RETRY_DELAY = float(os.getenv('DB_RETRY_DELAY', 1.0))
 BATCH_SIZE = int(os.getenv('DB_BATCH_SIZE', 1000))
 MAX_WORKERS = int(os.getenv('DB_MAX_WORKERS', 4))
+WRITE_BATCH_SIZE = int(os.getenv('DB_WRITE_BATCH_SIZE', 500))
+WRITE_FLUSH_INTERVAL = float(os.getenv('DB_WRITE_FLUSH_INTERVAL_MS', 250)) / 1000
+BUSY_THRESHOLD = float(os.getenv('DB_BUSY_THRESHOLD_MS', 500)) / 1000
 
 class DatabaseError(Exception):
     pass
@@ -60,6 +66,7 @@ class ConnectionPool:
                     conn.execute("PRAGMA journal_mode=WAL")
                     conn.execute("PRAGMA synchronous=NORMAL")
                     conn.execute("PRAGMA cache_size=10000")
+                    conn.execute("PRAGMA recursive_triggers=ON")
                     return conn
                 except sqlite3.OperationalError as e:
                     print(f"[ERROR] Failed to open database file: {e}")
@@ -76,6 +83,7 @@ class ConnectionPool:
 # Create connection pools
 main_pool = ConnectionPool(DB_FILE)
 archive_pool = ConnectionPool(ARCHIVE_DB_FILE)
+tmdb_cache_pool = ConnectionPool(TMDB_CACHE_DB_FILE)
 
 def with_connection(pool):
     def decorator(func):
@@ -89,11 +97,108 @@ def with_connection(pool):
         return wrapper
     return decorator
 
+class AdaptiveThrottle:
+    """
+    Contention-aware token bucket for database writers.
+    Writers run unthrottled until SQLite reports a lock. The rate then starts at
+    THROTTLE_RATE, halves on every further contention and recovers additively on
+    success until it is lifted again. Reads are never throttled under WAL.
+    """
+    def __init__(self, base_rate=THROTTLE_RATE, min_rate=1.0):
+        self.base_rate = max(base_rate, min_rate)
+        self.min_rate = min_rate
+        self.rate = None
+        self.tokens = 0.0
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+        self.stats = {
+            'calls': 0,
+            'throttled_calls': 0,
+            'wait_time': 0.0,
+            'contention_events': 0,
+            'busy_time': 0.0,
+        }
+
+    def acquire(self):
+        with self.lock:
+            self.stats['calls'] += 1
+            if self.rate is None:
+                return
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.last_refill) * self.rate)
+            self.last_refill = now
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return
+            delay = -self.tokens / self.rate
+            self.stats['throttled_calls'] += 1
+            self.stats['wait_time'] += delay
+        time.sleep(delay)
+
+    def record_contention(self, busy_seconds=0.0):
+        with self.lock:
+            self.stats['contention_events'] += 1
+            self.stats['busy_time'] += busy_seconds
+            if self.rate is None:
+                self.rate = self.base_rate
+                self.tokens = 0.0
+                self.last_refill = time.monotonic()
+                log_message(f"Database contention detected, throttling writes to {self.rate:.1f}/s", level="DEBUG")
+            else:
+                self.rate = max(self.min_rate, self.rate / 2)
+
+    def record_success(self):
+        if self.rate is None:
+            return
+        with self.lock:
+            if self.rate is None:
+                return
+            self.rate += 1.0
+            if self.rate >= self.base_rate * 4:
+                self.rate = None
+                log_message("Database contention cleared, write throttling lifted", level="DEBUG")
+
+    def get_stats(self):
+        with self.lock:
+            stats = dict(self.stats)
+            stats['current_rate'] = self.rate
+        return stats
+
+db_throttle = AdaptiveThrottle()
+
+def get_throttle_stats():
+    """Return counters for time writers have spent waiting on the throttle."""
+    return db_throttle.get_stats()
+
+_lock_state = threading.local()
+
+def is_database_locked(error):
+    """True for the SQLite lock errors that retry_on_db_lock retries."""
+    return isinstance(error, sqlite3.OperationalError) and "database is locked" in str(error)
+
 def throttle(func):
+    """
+    Pace a write helper through the adaptive throttle and report how the write went.
+    Only writes report outcomes, so read traffic cannot lift a throttle writers engaged.
+    A write that hit a lock error or spent at least DB_BUSY_THRESHOLD_MS waiting counts
+    as contention, and its duration is added to the busy time.
+    """
     @wraps(func)
     def wrapper(*args, **kwargs):
-        time.sleep(1 / THROTTLE_RATE)
-        return func(*args, **kwargs)
+        db_throttle.acquire()
+        _lock_state.contended = False
+        start = time.monotonic()
+        try:
+            result = func(*args, **kwargs)
+        except DatabaseError:
+            db_throttle.record_contention(time.monotonic() - start)
+            raise
+        elapsed = time.monotonic() - start
+        if _lock_state.contended or elapsed >= BUSY_THRESHOLD:
+            db_throttle.record_contention(elapsed)
+        else:
+            db_throttle.record_success()
+        return result
     return wrapper
 
 def retry_on_db_lock(func):
@@ -103,6 +208,8 @@ def retry_on_db_lock(func):
             try:
                 return func(*args, **kwargs)
             except sqlite3.OperationalError as e:
+                if is_database_locked(e):
+                    _lock_state.contended = True
                 if "database is locked" in str(e) and attempt < MAX_RETRIES - 1:
                     log_message(f"Database locked, retrying in {RETRY_DELAY} seconds (attempt {attempt + 1}/{MAX_RETRIES})", level="WARNING")
                     time.sleep(RETRY_DELAY)
@@ -110,6 +217,181 @@ def retry_on_db_lock(func):
                     raise DatabaseError(f"Database operation failed after {MAX_RETRIES} attempts: {e}")
     return wrapper
 
+def create_search_index(cursor):
+    """
+    Create the trigram FTS5 index over processed_files, kept in sync by triggers.
+    Returns False when this SQLite build has no FTS5 trigram tokenizer.
+    """
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='processed_files_fts'")
+    index_exists = cursor.fetchone() is not None
+
+    if not index_exists:
+        try:
+            cursor.execute("""
+                CREATE VIRTUAL TABLE processed_files_fts USING fts5(
+                    file_path, destination_path, tmdb_id,
+                    content='processed_files', content_rowid='rowid', tokenize='trigram'
+                )
+            """)
+        except sqlite3.OperationalError as e:
+            log_message(f"Full-text search index unavailable, searches will scan the table: {e}", level="WARNING")
+            return False
+
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS processed_files_fts_insert AFTER INSERT ON processed_files BEGIN
+            INSERT INTO processed_files_fts (rowid, file_path, destination_path, tmdb_id)
+            VALUES (new.rowid, new.file_path, new.destination_path, new.tmdb_id);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS processed_files_fts_delete AFTER DELETE ON processed_files BEGIN
+            INSERT INTO processed_files_fts (processed_files_fts, rowid, file_path, destination_path, tmdb_id)
+            VALUES ('delete', old.rowid, old.file_path, old.destination_path, old.tmdb_id);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS processed_files_fts_update
+        AFTER UPDATE OF file_path, destination_path, tmdb_id ON processed_files BEGIN
+            INSERT INTO processed_files_fts (processed_files_fts, rowid, file_path, destination_path, tmdb_id)
+            VALUES ('delete', old.rowid, old.file_path, old.destination_path, old.tmdb_id);
+            INSERT INTO processed_files_fts (rowid, file_path, destination_path, tmdb_id)
+            VALUES (new.rowid, new.file_path, new.destination_path, new.tmdb_id);
+        END
+    """)
+
+    if not index_exists:
+        cursor.execute("INSERT INTO processed_files_fts (processed_files_fts) VALUES ('rebuild')")
+        log_message("Built full-text search index for processed_files.", level="INFO")
+    return True
+
+def create_event_journal(cursor):
+    """
+    Create the append-only events journal, fed by triggers on processed_files so every
+    event is written in the same transaction as the row change that caused it.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS events (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            type TEXT NOT NULL,
+            source_path TEXT,
+            destination_path TEXT,
+            tmdb_id TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS processed_files_events_insert
+        AFTER INSERT ON processed_files WHEN new.destination_path IS NOT NULL BEGIN
+            INSERT INTO events (type, source_path, destination_path, tmdb_id)
+            VALUES ('created', new.file_path, new.destination_path, new.tmdb_id);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS processed_files_events_update
+        AFTER UPDATE OF destination_path, tmdb_id ON processed_files
+        WHEN new.destination_path IS NOT old.destination_path OR new.tmdb_id IS NOT old.tmdb_id BEGIN
+            INSERT INTO events (type, source_path, destination_path, tmdb_id)
+            VALUES (
+                CASE
+                    WHEN new.destination_path IS NULL THEN 'deleted'
+                    WHEN old.destination_path IS NULL THEN 'created'
+                    ELSE 'updated'
+                END,
+                new.file_path, COALESCE(new.destination_path, old.destination_path), new.tmdb_id
+            );
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS processed_files_events_delete
+        AFTER DELETE ON processed_files WHEN old.destination_path IS NOT NULL BEGIN
+            INSERT INTO events (type, source_path, destination_path, tmdb_id)
+            VALUES ('deleted', old.file_path, old.destination_path, old.tmdb_id);
+        END
+    """)
+
+def create_schema(cursor):
+    """Create or migrate every table, index and trigger of the processed files database."""
+    # Create the processed_files table if it doesn't exist
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS processed_files (
+            file_path TEXT PRIMARY KEY,
+            destination_path TEXT,
+            tmdb_id TEXT,
+            season_number TEXT,
+            reason TEXT,
+            parent_dir TEXT
+        )
+    """)
+
+    cursor.execute("PRAGMA table_info(processed_files)")
+    columns = [column[1] for column in cursor.fetchall()]
+
+    # Add column if it doesn't exist
+    if "destination_path" not in columns:
+        cursor.execute("ALTER TABLE processed_files ADD COLUMN destination_path TEXT")
+        log_message("Added destination_path column to processed_files table.", level="INFO")
+
+    if "tmdb_id" not in columns:
+        cursor.execute("ALTER TABLE processed_files ADD COLUMN tmdb_id TEXT")
+        log_message("Added tmdb_id column to processed_files table.", level="INFO")
+
+    if "season_number" not in columns:
+        cursor.execute("ALTER TABLE processed_files ADD COLUMN season_number TEXT")
+        log_message("Added season column to processed_files table.", level="INFO")
+
+    if "reason" not in columns:
+        cursor.execute("ALTER TABLE processed_files ADD COLUMN reason TEXT")
+        log_message("Added reason column to processed_files table.", level="INFO")
+
+    if "parent_dir" not in columns:
+        cursor.execute("ALTER TABLE processed_files ADD COLUMN parent_dir TEXT")
+        cursor.execute("SELECT rowid, file_path FROM processed_files")
+        cursor.executemany("UPDATE processed_files SET parent_dir = ? WHERE rowid = ?",
+                           [(os.path.dirname(file_path), rowid) for rowid, file_path in cursor.fetchall()])
+        log_message("Added parent_dir column to processed_files table.", level="INFO")
+
+    # Create indexes
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_file_path ON processed_files(file_path)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_destination_path ON processed_files(destination_path)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tmdb_id ON processed_files(tmdb_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_season_number ON processed_files(season_number)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_reason ON processed_files(reason)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_parent_dir ON processed_files(parent_dir)")
+
+    create_search_index(cursor)
+    create_event_journal(cursor)
+
+    # Directory fingerprints used to skip re-listing unchanged source directories
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS directory_fingerprints (
+            path TEXT PRIMARY KEY,
+            parent_path TEXT,
+            mtime REAL,
+            entry_count INTEGER,
+            name_hash TEXT,
+            complete INTEGER DEFAULT 0
+        )
+    """)
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_fingerprint_parent ON directory_fingerprints(parent_path)")
+
+    # Per-directory listing snapshot used by the monitor to diff source trees
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS monitor_snapshot (
+            path TEXT PRIMARY KEY,
+            mtime REAL,
+            entries TEXT
+        )
+    """)
+
+    # Key/value checkpoint of the monitor so restarts can resume from the snapshot
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS monitor_state (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+    """)
+
 @throttle
 @retry_on_db_lock
 def initialize_db():
@@ -125,43 +407,7 @@ def initialize_db():
     try:
         cursor = conn.cursor()
 
-        # Create the processed_files table if it doesn't exist
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS processed_files (
-                file_path TEXT PRIMARY KEY,
-                destination_path TEXT,
-                tmdb_id TEXT,
-                season_number TEXT,
-                reason TEXT
-            )
-        """)
-
-        cursor.execute("PRAGMA table_info(processed_files)")
-        columns = [column[1] for column in cursor.fetchall()]
-
-        # Add column if it doesn't exist
-        if "destination_path" not in columns:
-            cursor.execute("ALTER TABLE processed_files ADD COLUMN destination_path TEXT")
-            log_message("Added destination_path column to processed_files table.", level="INFO")
-
-        if "tmdb_id" not in columns:
-            cursor.execute("ALTER TABLE processed_files ADD COLUMN tmdb_id TEXT")
-            log_message("Added tmdb_id column to processed_files table.", level="INFO")
-
-        if "season_number" not in columns:
-            cursor.execute("ALTER TABLE processed_files ADD COLUMN season_number TEXT")
-            log_message("Added season column to processed_files table.", level="INFO")
-
-        if "reason" not in columns:
-            cursor.execute("ALTER TABLE processed_files ADD COLUMN reason TEXT")
-            log_message("Added reason column to processed_files table.", level="INFO")
-
-        # Create indexes
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_file_path ON processed_files(file_path)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_destination_path ON processed_files(destination_path)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_tmdb_id ON processed_files(tmdb_id)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_season_number ON processed_files(season_number)")
-        cursor.execute("CREATE INDEX IF NOT EXISTS idx_reason ON processed_files(reason)")
+        create_schema(cursor)
 
         conn.commit()
         log_message("Database schema is up to date.", level="INFO")
@@ -198,10 +444,12 @@ def archive_old_records(conn):
             cursor.execute("DELETE FROM processed_files WHERE rowid NOT IN (SELECT rowid FROM processed_files ORDER BY rowid DESC LIMIT ?)", (MAX_RECORDS,))
             conn.commit()
     except (sqlite3.Error, DatabaseError) as e:
+        if is_database_locked(e):
+            conn.rollback()
+            raise
         log_message(f"Error in archive_old_records: {e}", level="ERROR")
         conn.rollback()
 
-@throttle
 @retry_on_db_lock
 @with_connection(main_pool)
 def load_processed_files(conn):
@@ -222,36 +470,300 @@ def load_processed_files(conn):
 @throttle
 @retry_on_db_lock
 @with_connection(main_pool)
-def save_processed_file(conn, source_path, dest_path=None, tmdb_id=None, season_number=None, reason=None):
+def write_processed_files(conn, rows):
+    """Upsert a batch of processed_files rows in a single transaction."""
+    try:
+        cursor = conn.cursor()
+        cursor.executemany("""
+            INSERT INTO processed_files (file_path, destination_path, tmdb_id, season_number, reason, parent_dir)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(file_path) DO UPDATE SET
+                destination_path = excluded.destination_path,
+                tmdb_id = excluded.tmdb_id,
+                season_number = excluded.season_number,
+                reason = excluded.reason,
+                parent_dir = excluded.parent_dir
+        """, rows)
+        conn.commit()
+    except sqlite3.OperationalError:
+        conn.rollback()
+        raise
+    except (sqlite3.Error, DatabaseError) as e:
+        log_message(f"Error in write_processed_files: {e}", level="ERROR")
+        conn.rollback()
+
+class DatabaseWriter:
+    """
+    Write-behind queue for processed_files.
+    A single thread drains queued rows and group-commits them every
+    batch_size rows or flush_interval seconds, whichever comes first.
+    """
+    _STOP = object()
+
+    def __init__(self, batch_size=WRITE_BATCH_SIZE, flush_interval=WRITE_FLUSH_INTERVAL):
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue()
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def _ensure_started(self):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name="DatabaseWriter", daemon=True)
+                self.thread.start()
+
+    def put(self, row, wait=False):
+        """Queue a row; block until it is committed only when wait is True."""
+        self._ensure_started()
+        done = threading.Event() if wait else None
+        self.queue.put((row, done))
+        if done:
+            done.wait()
+
+    def flush(self):
+        """Block until every row queued before this call has been committed."""
+        if self.thread is None or not self.thread.is_alive():
+            return
+        done = threading.Event()
+        self.queue.put((None, done))
+        done.wait()
+
+    def stop(self):
+        """Flush pending rows and stop the writer thread."""
+        if self.thread is None or not self.thread.is_alive():
+            return
+        self.queue.put((self._STOP, None))
+        self.thread.join()
+
+    def _run(self):
+        while True:
+            row, done = self.queue.get()
+            rows, waiters, stop = [], [], False
+            deadline = time.monotonic() + self.flush_interval
+
+            while True:
+                if row is self._STOP:
+                    stop = True
+                    break
+                if row is not None:
+                    rows.append(row)
+                if done is not None:
+                    waiters.append(done)
+                    # Flush requests and waiting callers commit immediately
+                    break
+                if len(rows) >= self.batch_size:
+                    break
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    row, done = self.queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+
+            if rows:
+                try:
+                    write_processed_files(rows)
+                except Exception as e:
+                    log_message(f"Error committing {len(rows)} queued database writes: {e}", level="ERROR")
+
+            for waiter in waiters:
+                waiter.set()
+
+            if stop:
+                return
+
+db_writer = DatabaseWriter()
+
+def flush_pending_writes():
+    """Commit all queued processed_files writes before returning."""
+    db_writer.flush()
+
+atexit.register(db_writer.stop)
+
+def save_processed_file(source_path, dest_path=None, tmdb_id=None, season_number=None, reason=None, wait=False):
+    """
+    Queue a processed_files upsert on the write-behind writer.
+    Pass wait=True when the caller needs to read the row back immediately.
+    """
     source_path = normalize_file_path(source_path)
     if dest_path:
         dest_path = normalize_file_path(dest_path)
+    if path_filter is not None:
+        path_filter.add(source_path, dest_path)
+    db_writer.put((source_path, dest_path, tmdb_id, season_number, reason, os.path.dirname(source_path)), wait=wait)
+
+class PathMembershipFilter:
+    """
+    In-process membership filter over processed_files.file_path and destination_path.
+    Only path hashes are kept, so a miss is definitive while a hit is confirmed in SQLite.
+    New rows are picked up by rowid and destination changes on existing rows from the
+    events journal; the filter is reloaded whenever rowids may have been renumbered or
+    journal events it never saw were pruned.
+    """
+    def __init__(self):
+        self.hashes = set()
+        self.last_rowid = 0
+        self.last_event_id = 0
+        self.renumbered_at = None
+        self.loaded = False
+        self._reload_adds = None
+        self.lock = threading.Lock()
+
+    def add(self, *paths):
+        with self.lock:
+            for path in paths:
+                if path:
+                    self.hashes.add(hash(path))
+                    if self._reload_adds is not None:
+                        self._reload_adds.add(hash(path))
+
+    def might_contain(self, path):
+        return hash(path) in self.hashes
+
+    def refresh(self):
+        """Pull rows written since the last refresh, including those written by other processes."""
+        renumbered_at, max_rowid, oldest_event_id, latest_event_id = get_path_filter_marks()
+        events_lost = latest_event_id > self.last_event_id and oldest_event_id > self.last_event_id + 1
+        if not self.loaded or renumbered_at != self.renumbered_at or max_rowid < self.last_rowid or events_lost:
+            # Rows already seen may now sit below last_rowid, so start over from the table
+            self._reload(renumbered_at, latest_event_id)
+
+        rows = fetch_processed_paths_since(self.last_rowid)
+        with self.lock:
+            for rowid, file_path, dest_path in rows:
+                self.hashes.add(hash(file_path))
+                if dest_path:
+                    self.hashes.add(hash(dest_path))
+            if rows:
+                self.last_rowid = rows[-1][0]
+
+        # Upserts keep their rowid, so destination changes only show up in the journal
+        while self.last_event_id < latest_event_id:
+            events = fetch_events_since(self.last_event_id)
+            if not events:
+                break
+            self.add(*(path for event in events for path in (event[2], event[3])))
+            self.last_event_id = events[-1][0]
+
+    def _reload(self, renumbered_at, latest_event_id):
+        """
+        Rebuild the hash set from the whole table off to the side and swap it in at once,
+        so concurrent lookups never see a partial set. Paths added while the reload runs
+        are carried over, and queued writes are flushed first so none are missed.
+        """
+        with self.lock:
+            self._reload_adds = set()
+        flush_pending_writes()
+
+        hashes = set()
+        rows = fetch_processed_paths_since(0)
+        for rowid, file_path, dest_path in rows:
+            hashes.add(hash(file_path))
+            if dest_path:
+                hashes.add(hash(dest_path))
+
+        with self.lock:
+            hashes |= self._reload_adds
+            self._reload_adds = None
+            self.hashes = hashes
+            self.last_rowid = rows[-1][0] if rows else 0
+            self.last_event_id = latest_event_id
+            self.renumbered_at = renumbered_at
+            self.loaded = True
+
+@retry_on_db_lock
+@with_connection(main_pool)
+def get_path_filter_marks(conn):
+    """
+    Return (rowids_renumbered_at, max_rowid, oldest_event_id, latest_event_id), used by the
+    path filter to decide between an incremental refresh and a full reload.
+    """
     try:
         cursor = conn.cursor()
         cursor.execute("""
-            INSERT OR REPLACE INTO processed_files (file_path, destination_path, tmdb_id, season_number, reason)
-            VALUES (?, ?, ?, ?, ?)
-        """, (source_path, dest_path, tmdb_id, season_number, reason))
-        conn.commit()
+            SELECT
+                (SELECT value FROM monitor_state WHERE key = 'rowids_renumbered_at'),
+                (SELECT MAX(rowid) FROM processed_files),
+                (SELECT MIN(id) FROM events),
+                (SELECT MAX(id) FROM events)
+        """)
+        renumbered_at, max_rowid, oldest_event_id, latest_event_id = cursor.fetchone()
+        return renumbered_at, max_rowid or 0, oldest_event_id or 0, latest_event_id or 0
     except (sqlite3.Error, DatabaseError) as e:
-        log_message(f"Error in save_processed_file: {e}", level="ERROR")
+        log_message(f"Error in get_path_filter_marks: {e}", level="ERROR")
         conn.rollback()
+        return None, 0, 0, 0
+
+def mark_rowids_renumbered(cursor):
+    """Record that processed_files rowids may have changed, so path filters reload."""
+    cursor.execute("""
+        INSERT INTO monitor_state (key, value) VALUES ('rowids_renumbered_at', ?)
+        ON CONFLICT(key) DO UPDATE SET value = excluded.value
+    """, (str(time.time()),))
 
-@throttle
 @retry_on_db_lock
 @with_connection(main_pool)
-def check_file_in_db(conn, file_path):
+def fetch_processed_paths_since(conn, last_rowid):
+    """Return (rowid, file_path, destination_path) rows inserted after last_rowid."""
+    rows = []
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT rowid, file_path, destination_path
+            FROM processed_files
+            WHERE rowid > ?
+            ORDER BY rowid
+        """, (last_rowid,))
+        while True:
+            batch = cursor.fetchmany(BATCH_SIZE)
+            if not batch:
+                break
+            rows.extend(batch)
+    except (sqlite3.Error, DatabaseError) as e:
+        log_message(f"Error in fetch_processed_paths_since: {e}", level="ERROR")
+        conn.rollback()
+    return rows
+
+path_filter = None
+
+def enable_path_filter():
+    """Load the membership filter so negative check_file_in_db lookups skip SQLite."""
+    global path_filter
+    if path_filter is None:
+        path_filter = PathMembershipFilter()
+        path_filter.refresh()
+        log_message(f"Loaded path filter with {len(path_filter.hashes)} entries", level="DEBUG")
+    return path_filter
+
+def refresh_path_filter():
+    """Pick up rows written since the filter was last loaded."""
+    if path_filter is not None:
+        path_filter.refresh()
+
+def check_file_in_db(file_path):
     file_path = normalize_file_path(file_path)
+    if path_filter is not None and not path_filter.might_contain(file_path):
+        return False
+    return _query_file_in_db(file_path)
+
+@retry_on_db_lock
+@with_connection(main_pool)
+def _query_file_in_db(conn, file_path):
     try:
         cursor = conn.cursor()
+        # Two index seeks instead of an OR that SQLite cannot serve from a single index
         cursor.execute("""
-            SELECT COUNT(*) FROM processed_files
-            WHERE file_path = ? OR destination_path = ?
+            SELECT 1 FROM processed_files WHERE file_path = ?
+            UNION ALL
+            SELECT 1 FROM processed_files WHERE destination_path = ?
+            LIMIT 1
         """, (file_path, file_path))
-        count = cursor.fetchone()[0]
-        if count > 0:
+        found = cursor.fetchone() is not None
+        if found:
             log_message(f"File found in database: {file_path}", level="DEBUG")
-        return count > 0
+        return found
     except (sqlite3.Error, DatabaseError) as e:
         log_message(f"Error in check_file_in_db: {e}", level="ERROR")
         conn.rollback()
@@ -283,7 +795,6 @@ def process_file_batch(batch, file_set, destination_folder):
             log_message(f"Missing file: {file_path} - Expected at: {os.path.join(destination_folder, file_name)}", level="DEBUG")
     return missing_files
 
-@throttle
 @retry_on_db_lock
 @with_connection(main_pool)
 def display_missing_files(conn, destination_folder):
@@ -376,15 +887,37 @@ def update_renamed_file(conn, old_dest_path, new_dest_path):
             WHERE destination_path = ?
         """, (new_dest_path, old_dest_path))
         conn.commit()
+        if path_filter is not None:
+            path_filter.add(new_dest_path)
         if cursor.rowcount > 0:
             log_message(f"Updated renamed file in database: {old_dest_path} -> {new_dest_path}", level="INFO")
         else:
             log_message(f"No matching record found for renamed file: {old_dest_path}", level="WARNING")
     except (sqlite3.Error, DatabaseError) as e:
+        if is_database_locked(e):
+            conn.rollback()
+            raise
         log_message(f"Error updating renamed file in database: {e}", level="ERROR")
         conn.rollback()
 
 @throttle
+@retry_on_db_lock
+@with_connection(main_pool)
+def delete_processed_destinations(conn, dest_paths):
+    """Delete the processed_files rows of a batch of destination paths in a single transaction."""
+    try:
+        cursor = conn.cursor()
+        cursor.executemany("DELETE FROM processed_files WHERE destination_path = ?", [(path,) for path in dest_paths])
+        conn.commit()
+        return cursor.rowcount
+    except (sqlite3.Error, DatabaseError) as e:
+        if is_database_locked(e):
+            conn.rollback()
+            raise
+        log_message(f"Error in delete_processed_destinations: {e}", level="ERROR")
+        conn.rollback()
+        return 0
+
 @retry_on_db_lock
 @with_connection(main_pool)
 def get_destination_path(conn, source_path):
@@ -399,23 +932,95 @@ def get_destination_path(conn, source_path):
         conn.rollback()
         return None
 
-@throttle
 @retry_on_db_lock
 @with_connection(main_pool)
-def reset_database(conn):
-    """Reset the database by dropping and recreating all tables and reclaiming space."""
+def get_file_record(conn, source_path):
+    """
+    Fetch the processed_files record for a source file in a single indexed query.
+    Returns (destination_path, tmdb_id, season_number, reason) or None.
+    """
+    source_path = normalize_file_path(source_path)
     try:
         cursor = conn.cursor()
+        cursor.execute("""
+            SELECT destination_path, tmdb_id, season_number, reason
+            FROM processed_files
+            WHERE file_path = ?
+        """, (source_path,))
+        return cursor.fetchone()
+    except (sqlite3.Error, DatabaseError) as e:
+        log_message(f"Error in get_file_record: {e}", level="ERROR")
+        conn.rollback()
+        return None
 
-        cursor.execute("DROP TABLE IF EXISTS processed_files")
-        cursor.execute("DROP TABLE IF EXISTS processed_files_archive")
+@retry_on_db_lock
+@with_connection(main_pool)
+def get_files_in_directory(conn, directory):
+    """Return processed_files source paths directly inside a directory via the parent_dir index."""
+    directory = normalize_file_path(directory)
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT file_path FROM processed_files WHERE parent_dir = ?", (directory,))
+        return [row[0] for row in cursor.fetchall()]
+    except (sqlite3.Error, DatabaseError) as e:
+        log_message(f"Error in get_files_in_directory: {e}", level="ERROR")
+        conn.rollback()
+        return []
 
+@retry_on_db_lock
+@with_connection(main_pool)
+def get_file_records(conn, source_paths):
+    """
+    Bulk variant of get_file_record joining the paths through a temp table.
+    Returns {file_path: (destination_path, tmdb_id, season_number, reason)} for paths found.
+    """
+    paths = {normalize_file_path(path) for path in source_paths}
+    records = {}
+    if not paths:
+        return records
+    try:
+        cursor = conn.cursor()
+        cursor.execute("CREATE TEMP TABLE IF NOT EXISTS lookup_paths (file_path TEXT PRIMARY KEY)")
+        cursor.execute("DELETE FROM lookup_paths")
+        cursor.executemany("INSERT OR IGNORE INTO lookup_paths (file_path) VALUES (?)", ((path,) for path in paths))
         cursor.execute("""
-            CREATE TABLE processed_files (
-                file_path TEXT PRIMARY KEY,
-                destination_path TEXT
-            )
+            SELECT pf.file_path, pf.destination_path, pf.tmdb_id, pf.season_number, pf.reason
+            FROM lookup_paths lp
+            JOIN processed_files pf ON pf.file_path = lp.file_path
         """)
+        while True:
+            batch = cursor.fetchmany(BATCH_SIZE)
+            if not batch:
+                break
+            for file_path, dest_path, tmdb_id, season_number, reason in batch:
+                records[file_path] = (dest_path, tmdb_id, season_number, reason)
+        cursor.execute("DELETE FROM lookup_paths")
+        conn.commit()
+    except (sqlite3.Error, DatabaseError) as e:
+        log_message(f"Error in get_file_records: {e}", level="ERROR")
+        conn.rollback()
+    return records
+
+@retry_on_db_lock
+@with_connection(main_pool)
+def reset_database(conn):
+    """
+    Reset the database by dropping and recreating all tables and reclaiming space.
+    A 'reset' event is journaled first so event consumers know to drop everything they hold.
+    """
+    try:
+        cursor = conn.cursor()
+
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'events'")
+        if cursor.fetchone():
+            cursor.execute("INSERT INTO events (type) VALUES ('reset')")
+
+        cursor.execute("DROP TABLE IF EXISTS processed_files_fts")
+        cursor.execute("DROP TABLE IF EXISTS processed_files")
+        cursor.execute("DROP TABLE IF EXISTS processed_files_archive")
+        cursor.execute("DROP TABLE IF EXISTS directory_fingerprints")
+        cursor.execute("DROP TABLE IF EXISTS monitor_snapshot")
+        cursor.execute("DROP TABLE IF EXISTS monitor_state")
 
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS processed_files_archive (
@@ -425,8 +1030,9 @@ def reset_database(conn):
             )
         """)
 
-        cursor.execute("CREATE INDEX idx_file_path ON processed_files(file_path)")
-        cursor.execute("CREATE INDEX idx_destination_path ON processed_files(destination_path)")
+        # Same schema path as initialize_db; the events journal survives, ending in the reset event
+        create_schema(cursor)
+        mark_rowids_renumbered(cursor)
         conn.commit()
 
         cursor.execute("VACUUM")
@@ -458,6 +1064,9 @@ def cleanup_database(conn):
         log_message(f"Database cleanup completed. Removed {deleted_count} invalid entries.", level="INFO")
         return deleted_count
     except (sqlite3.Error, DatabaseError) as e:
+        if is_database_locked(e):
+            conn.rollback()
+            raise
         log_message(f"Error during database cleanup: {e}", level="ERROR")
         conn.rollback()
         return None
@@ -475,6 +1084,13 @@ def vacuum_database(conn):
 
         # Execute vacuum
         cursor.execute("VACUUM")
+        mark_rowids_renumbered(cursor)
+        conn.commit()
+
+        # VACUUM may renumber rowids, so rebuild the full-text index against them
+        if _has_search_index(cursor):
+            cursor.execute("INSERT INTO processed_files_fts (processed_files_fts) VALUES ('rebuild')")
+            conn.commit()
 
         # Analyze tables after vacuum
         cursor.execute("ANALYZE")
@@ -482,10 +1098,12 @@ def vacuum_database(conn):
         log_message("Database vacuum completed successfully.", level="INFO")
         return True
     except (sqlite3.Error, DatabaseError) as e:
+        if is_database_locked(e):
+            conn.rollback()
+            raise
         log_message(f"Error during database vacuum: {e}", level="ERROR")
         return False
 
-@throttle
 @retry_on_db_lock
 @with_connection(main_pool)
 def verify_database_integrity(conn):
@@ -505,7 +1123,6 @@ def verify_database_integrity(conn):
         log_message(f"Error during integrity check: {e}", level="ERROR")
         return False
 
-@throttle
 @retry_on_db_lock
 @with_connection(main_pool)
 def export_database(conn, export_path):
@@ -531,7 +1148,6 @@ def export_database(conn, export_path):
         log_message(f"Error exporting database: {e}", level="ERROR")
         return False
 
-@throttle
 @retry_on_db_lock
 @with_connection(main_pool)
 def get_database_stats(conn):
@@ -626,20 +1242,22 @@ def import_database(conn, import_path):
                     dest_path = os.path.normpath(row[1]) if row[1] else None
 
                     if (source_path and os.path.exists(source_path)) or (dest_path and os.path.exists(dest_path)):
-                        batch.append((source_path, dest_path))
+                        batch.append((source_path, dest_path, os.path.dirname(source_path) if source_path else None))
 
                 if len(batch) >= BATCH_SIZE:
                     cursor.executemany("""
-                        INSERT OR REPLACE INTO processed_files (file_path, destination_path)
-                        VALUES (?, ?)
+                        INSERT INTO processed_files (file_path, destination_path, parent_dir)
+                        VALUES (?, ?, ?)
+                        ON CONFLICT(file_path) DO UPDATE SET destination_path = excluded.destination_path
                     """, batch)
                     imported_count += len(batch)
                     batch = []
 
             if batch:
                 cursor.executemany("""
-                    INSERT OR REPLACE INTO processed_files (file_path, destination_path)
-                    VALUES (?, ?)
+                    INSERT INTO processed_files (file_path, destination_path, parent_dir)
+                    VALUES (?, ?, ?)
+                    ON CONFLICT(file_path) DO UPDATE SET destination_path = excluded.destination_path
                 """, batch)
                 imported_count += len(batch)
 
@@ -647,17 +1265,39 @@ def import_database(conn, import_path):
         log_message(f"Successfully imported {imported_count} records from {import_path}", level="INFO")
         return True
     except (sqlite3.Error, DatabaseError, IOError) as e:
+        if is_database_locked(e):
+            conn.rollback()
+            raise
         log_message(f"Error importing database: {e}", level="ERROR")
         conn.rollback()
         return False
 
-@throttle
-@retry_on_db_lock
-@with_connection(main_pool)
-def search_database(conn, pattern):
-    """Search for files in database matching the given pattern."""
-    try:
-        cursor = conn.cursor()
+_search_index_available = None
+
+def _has_search_index(cursor):
+    global _search_index_available
+    if _search_index_available is None:
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name='processed_files_fts'")
+        _search_index_available = cursor.fetchone() is not None
+    return _search_index_available
+
+def _prefix_bounds(path):
+    """Return the [lower, upper) range covering every path below a directory."""
+    prefix = path.rstrip(os.sep) + os.sep
+    return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+def _search_processed_files(cursor, pattern):
+    """Substring search over file_path, destination_path and tmdb_id through the trigram index."""
+    # Trigrams need at least three characters; shorter patterns fall back to a scan
+    if len(pattern) >= 3 and _has_search_index(cursor):
+        cursor.execute("""
+            SELECT file_path, destination_path, tmdb_id, season_number, reason
+            FROM processed_files
+            WHERE rowid IN (
+                SELECT rowid FROM processed_files_fts WHERE processed_files_fts MATCH ?
+            )
+        """, ('"' + pattern.replace('"', '""') + '"',))
+    else:
         search_pattern = f"%{pattern}%"
         cursor.execute("""
             SELECT file_path, destination_path, tmdb_id, season_number, reason
@@ -666,7 +1306,34 @@ def search_database(conn, pattern):
             OR destination_path LIKE ?
             OR tmdb_id LIKE ?
         """, (search_pattern, search_pattern, search_pattern))
-        results = cursor.fetchall()
+    return cursor.fetchall()
+
+def _search_processed_paths(cursor, path):
+    """Exact-path and directory-prefix lookup served by index range scans."""
+    path = normalize_file_path(path)
+    lower, upper = _prefix_bounds(path)
+    cursor.execute("""
+        SELECT file_path, destination_path, tmdb_id, season_number, reason
+        FROM processed_files WHERE file_path = ?
+        UNION
+        SELECT file_path, destination_path, tmdb_id, season_number, reason
+        FROM processed_files WHERE file_path >= ? AND file_path < ?
+        UNION
+        SELECT file_path, destination_path, tmdb_id, season_number, reason
+        FROM processed_files WHERE destination_path = ?
+        UNION
+        SELECT file_path, destination_path, tmdb_id, season_number, reason
+        FROM processed_files WHERE destination_path >= ? AND destination_path < ?
+    """, (path, lower, upper, path, lower, upper))
+    return cursor.fetchall()
+
+@retry_on_db_lock
+@with_connection(main_pool)
+def search_database(conn, pattern):
+    """Search for files in database matching the given pattern."""
+    try:
+        cursor = conn.cursor()
+        results = _search_processed_files(cursor, pattern)
         if results:
             log_message("-" * 50, level="INFO")
             log_message(f"Found {len(results)} matches for pattern '{pattern}':", level="INFO")
@@ -688,26 +1355,21 @@ def search_database(conn, pattern):
         log_message(f"Error searching database: {e}", level="ERROR")
         return []
 
-@throttle
 @retry_on_db_lock
 @with_connection(main_pool)
 def search_database_silent(conn, pattern):
-    """Silent version of search_database that never logs results."""
+    """
+    Silent version of search_database that never logs results.
+    Absolute paths are matched exactly or as directory prefixes through index range scans.
+    """
     try:
         cursor = conn.cursor()
-        search_pattern = f"%{pattern}%"
-        cursor.execute("""
-            SELECT file_path, destination_path, tmdb_id, season_number, reason
-            FROM processed_files
-            WHERE file_path LIKE ?
-            OR destination_path LIKE ?
-            OR tmdb_id LIKE ?
-        """, (search_pattern, search_pattern, search_pattern))
-        return cursor.fetchall()
+        if os.path.isabs(pattern):
+            return _search_processed_paths(cursor, pattern)
+        return _search_processed_files(cursor, pattern)
     except (sqlite3.Error, DatabaseError):
         return []
 
-@throttle
 @retry_on_db_lock
 @with_connection(main_pool)
 def get_skip_reason(conn, source_path):
@@ -722,6 +1384,212 @@ def get_skip_reason(conn, source_path):
         conn.rollback()
         return None
 
+@retry_on_db_lock
+@with_connection(main_pool)
+def load_directory_fingerprints(conn, root):
+    """
+    Load stored fingerprints for a source root and everything below it.
+    Returns {path: (parent_path, mtime, entry_count, name_hash, complete)}.
+    """
+    root = normalize_file_path(root)
+    lower, upper = _prefix_bounds(root)
+    fingerprints = {}
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT path, parent_path, mtime, entry_count, name_hash, complete
+            FROM directory_fingerprints
+            WHERE path = ? OR (path >= ? AND path < ?)
+        """, (root, lower, upper))
+        while True:
+            batch = cursor.fetchmany(BATCH_SIZE)
+            if not batch:
+                break
+            for path, parent_path, mtime, entry_count, name_hash, complete in batch:
+                fingerprints[path] = (parent_path, mtime, entry_count, name_hash, bool(complete))
+    except (sqlite3.Error, DatabaseError) as e:
+        log_message(f"Error in load_directory_fingerprints: {e}", level="ERROR")
+        conn.rollback()
+    return fingerprints
+
+@throttle
+@retry_on_db_lock
+@with_connection(main_pool)
+def save_directory_fingerprints(conn, fingerprints, removed_paths=()):
+    """
+    Upsert directory fingerprints and drop the subtrees of removed directories in one transaction.
+    fingerprints is an iterable of (path, parent_path, mtime, entry_count, name_hash, complete).
+    """
+    try:
+        cursor = conn.cursor()
+        for path in removed_paths:
+            lower, upper = _prefix_bounds(path)
+            cursor.execute("""
+                DELETE FROM directory_fingerprints
+                WHERE path = ? OR (path >= ? AND path < ?)
+            """, (path, lower, upper))
+        cursor.executemany("""
+            INSERT INTO directory_fingerprints (path, parent_path, mtime, entry_count, name_hash, complete)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(path) DO UPDATE SET
+                parent_path = excluded.parent_path,
+                mtime = excluded.mtime,
+                entry_count = excluded.entry_count,
+                name_hash = excluded.name_hash,
+                complete = excluded.complete
+        """, fingerprints)
+        conn.commit()
+    except (sqlite3.Error, DatabaseError) as e:
+        if is_database_locked(e):
+            conn.rollback()
+            raise
+        log_message(f"Error in save_directory_fingerprints: {e}", level="ERROR")
+        conn.rollback()
+
+@retry_on_db_lock
+@with_connection(main_pool)
+def load_monitor_snapshot(conn, root):
+    """
+    Load the monitor's directory snapshot for a source root and everything below it.
+    Returns {path: (mtime, entries_json)}.
+    """
+    root = normalize_file_path(root)
+    lower, upper = _prefix_bounds(root)
+    snapshot = {}
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT path, mtime, entries FROM monitor_snapshot
+            WHERE path = ? OR (path >= ? AND path < ?)
+        """, (root, lower, upper))
+        while True:
+            batch = cursor.fetchmany(BATCH_SIZE)
+            if not batch:
+                break
+            for path, mtime, entries in batch:
+                snapshot[path] = (mtime, entries)
+    except (sqlite3.Error, DatabaseError) as e:
+        log_message(f"Error in load_monitor_snapshot: {e}", level="ERROR")
+        conn.rollback()
+    return snapshot
+
+@throttle
+@retry_on_db_lock
+@with_connection(main_pool)
+def save_monitor_snapshot(conn, rows, removed_paths=()):
+    """
+    Upsert changed (path, mtime, entries_json) snapshot rows and drop removed subtrees in one transaction.
+    """
+    try:
+        cursor = conn.cursor()
+        for path in removed_paths:
+            lower, upper = _prefix_bounds(path)
+            cursor.execute("""
+                DELETE FROM monitor_snapshot
+                WHERE path = ? OR (path >= ? AND path < ?)
+            """, (path, lower, upper))
+        cursor.executemany("""
+            INSERT INTO monitor_snapshot (path, mtime, entries)
+            VALUES (?, ?, ?)
+            ON CONFLICT(path) DO UPDATE SET
+                mtime = excluded.mtime,
+                entries = excluded.entries
+        """, rows)
+        conn.commit()
+    except (sqlite3.Error, DatabaseError) as e:
+        if is_database_locked(e):
+            conn.rollback()
+            raise
+        log_message(f"Error in save_monitor_snapshot: {e}", level="ERROR")
+        conn.rollback()
+
+@retry_on_db_lock
+@with_connection(main_pool)
+def get_monitor_state(conn):
+    """Return the monitor checkpoint as a {key: value} dict."""
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT key, value FROM monitor_state")
+        return dict(cursor.fetchall())
+    except (sqlite3.Error, DatabaseError) as e:
+        log_message(f"Error in get_monitor_state: {e}", level="ERROR")
+        conn.rollback()
+        return {}
+
+@throttle
+@retry_on_db_lock
+@with_connection(main_pool)
+def save_monitor_state(conn, state):
+    """Upsert monitor checkpoint values from a {key: value} dict."""
+    try:
+        cursor = conn.cursor()
+        cursor.executemany("""
+            INSERT INTO monitor_state (key, value) VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET value = excluded.value
+        """, [(key, str(value)) for key, value in state.items()])
+        conn.commit()
+    except (sqlite3.Error, DatabaseError) as e:
+        if is_database_locked(e):
+            conn.rollback()
+            raise
+        log_message(f"Error in save_monitor_state: {e}", level="ERROR")
+        conn.rollback()
+
+@retry_on_db_lock
+@with_connection(main_pool)
+def fetch_events_since(conn, cursor_id, limit=BATCH_SIZE):
+    """
+    Return up to limit journal events with an id greater than cursor_id, oldest first, as
+    (id, type, source_path, destination_path, tmdb_id, created_at) tuples. Pass the id of
+    the last returned event as the next cursor.
+    """
+    try:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT id, type, source_path, destination_path, tmdb_id, created_at
+            FROM events
+            WHERE id > ?
+            ORDER BY id
+            LIMIT ?
+        """, (cursor_id, limit))
+        return cursor.fetchall()
+    except (sqlite3.Error, DatabaseError) as e:
+        log_message(f"Error in fetch_events_since: {e}", level="ERROR")
+        conn.rollback()
+        return []
+
+@retry_on_db_lock
+@with_connection(main_pool)
+def get_event_bounds(conn):
+    """Return (oldest_id, latest_id) of the events journal, or (0, 0) when it is empty."""
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT MIN(id), MAX(id) FROM events")
+        oldest_id, latest_id = cursor.fetchone()
+        return oldest_id or 0, latest_id or 0
+    except (sqlite3.Error, DatabaseError) as e:
+        log_message(f"Error in get_event_bounds: {e}", level="ERROR")
+        conn.rollback()
+        return 0, 0
+
+@throttle
+@retry_on_db_lock
+@with_connection(main_pool)
+def prune_events(conn, keep):
+    """Delete all but the newest keep journal events."""
+    try:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM events WHERE id <= (SELECT MAX(id) FROM events) - ?", (keep,))
+        conn.commit()
+        return cursor.rowcount
+    except (sqlite3.Error, DatabaseError) as e:
+        if is_database_locked(e):
+            conn.rollback()
+            raise
+        log_message(f"Error in prune_events: {e}", level="ERROR")
+        conn.rollback()
+        return 0
+
 @throttle
 @retry_on_db_lock
 @with_connection(main_pool)
@@ -735,7 +1603,190 @@ def optimize_database(conn):
         log_message("Database optimization completed successfully.", level="INFO")
         return True
     except (sqlite3.Error, DatabaseError) as e:
+        if is_database_locked(e):
+            conn.rollback()
+            raise
         log_message(f"Error optimizing database: {e}", level="ERROR")
         return False
 
+def initialize_tmdb_cache():
+    """Create the TMDB response and negative cache tables. Called when the TMDB client is created."""
+    os.makedirs(DB_DIR, exist_ok=True)
+    conn = sqlite3.connect(TMDB_CACHE_DB_FILE)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS tmdb_cache (
+                key TEXT PRIMARY KEY,
+                body BLOB,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL,
+                expires_at REAL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_tmdb_cache_expires ON tmdb_cache(expires_at)")
+
+        # Search variants known to return nothing, so fallback chains can skip them
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS tmdb_negative_cache (
+                key TEXT PRIMARY KEY,
+                expires_at REAL
+            )
+        """)
+
+        # Token bucket shared by every process making TMDB requests
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS tmdb_rate_limit (
+                id INTEGER PRIMARY KEY CHECK (id = 1),
+                tokens REAL,
+                updated REAL,
+                blocked_until REAL
+            )
+        """)
+        conn.commit()
+    except sqlite3.Error as e:
+        log_message(f"Failed to initialize TMDB cache database: {e}", level="ERROR")
+        conn.rollback()
+    finally:
+        conn.close()
+
+@retry_on_db_lock
+@with_connection(tmdb_cache_pool)
+def prune_tmdb_cache(conn, stale_days=30):
+    """
+    Drop cached TMDB responses that expired more than stale_days ago, keeping recently
+    expired ones for revalidation, and all expired negative entries. Returns rows deleted.
+    """
+    try:
+        cursor = conn.cursor()
+        cursor.execute("DELETE FROM tmdb_cache WHERE expires_at < ?", (time.time() - stale_days * 86400,))
+        deleted = cursor.rowcount
+        cursor.execute("DELETE FROM tmdb_negative_cache WHERE expires_at < ?", (time.time(),))
+        deleted += cursor.rowcount
+        conn.commit()
+        return deleted
+    except (sqlite3.Error, DatabaseError) as e:
+        log_message(f"Error in prune_tmdb_cache: {e}", level="ERROR")
+        conn.rollback()
+        return 0
+
+@retry_on_db_lock
+@with_connection(tmdb_cache_pool)
+def get_tmdb_cache_entry(conn, key):
+    """Return (body, etag, last_modified, expires_at) for a cached TMDB response, or None."""
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT body, etag, last_modified, expires_at FROM tmdb_cache WHERE key = ?", (key,))
+        return cursor.fetchone()
+    except (sqlite3.Error, DatabaseError) as e:
+        log_message(f"Error in get_tmdb_cache_entry: {e}", level="ERROR")
+        conn.rollback()
+        return None
+
+@retry_on_db_lock
+@with_connection(tmdb_cache_pool)
+def save_tmdb_cache_entry(conn, key, body, etag, last_modified, expires_at):
+    """Upsert a TMDB response body with its validators and expiry time."""
+    try:
+        conn.execute("""
+            INSERT INTO tmdb_cache (key, body, etag, last_modified, fetched_at, expires_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(key) DO UPDATE SET
+                body = excluded.body,
+                etag = excluded.etag,
+                last_modified = excluded.last_modified,
+                fetched_at = excluded.fetched_at,
+                expires_at = excluded.expires_at
+        """, (key, body, etag, last_modified, time.time(), expires_at))
+        conn.commit()
+    except (sqlite3.Error, DatabaseError) as e:
+        log_message(f"Error in save_tmdb_cache_entry: {e}", level="ERROR")
+        conn.rollback()
+
+@retry_on_db_lock
+@with_connection(tmdb_cache_pool)
+def refresh_tmdb_cache_entry(conn, key, expires_at):
+    """Extend the expiry of a cached TMDB response after a successful revalidation."""
+    try:
+        conn.execute("UPDATE tmdb_cache SET fetched_at = ?, expires_at = ? WHERE key = ?", (time.time(), expires_at, key))
+        conn.commit()
+    except (sqlite3.Error, DatabaseError) as e:
+        log_message(f"Error in refresh_tmdb_cache_entry: {e}", level="ERROR")
+        conn.rollback()
+
+@retry_on_db_lock
+@with_connection(tmdb_cache_pool)
+def take_tmdb_rate_token(conn, rate, window, min_tokens=1, block_seconds=0):
+    """
+    Take one token from the TMDB token bucket shared by every process. The bucket holds up
+    to rate tokens and refills at rate per window seconds; a token is only taken while at
+    least min_tokens are available. Pass block_seconds to hold all requests instead, e.g.
+    after a 429. Returns 0 when a token was taken, the seconds to wait before trying again,
+    or None if the bucket could not be read.
+    """
+    try:
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        now = time.time()
+        cursor.execute("SELECT tokens, updated, blocked_until FROM tmdb_rate_limit WHERE id = 1")
+        tokens, updated, blocked_until = cursor.fetchone() or (rate, now, 0)
+        tokens = min(rate, tokens + max(0, now - updated) * rate / window)
+
+        if block_seconds:
+            blocked_until = max(blocked_until, now + block_seconds)
+            tokens = 0
+            wait = block_seconds
+        elif now < blocked_until:
+            wait = blocked_until - now
+        elif tokens >= min_tokens:
+            tokens -= 1
+            wait = 0
+        else:
+            wait = (min_tokens - tokens) * window / rate
+
+        cursor.execute("""
+            INSERT INTO tmdb_rate_limit (id, tokens, updated, blocked_until) VALUES (1, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET
+                tokens = excluded.tokens,
+                updated = excluded.updated,
+                blocked_until = excluded.blocked_until
+        """, (tokens, now, blocked_until))
+        conn.commit()
+        return wait
+    except (sqlite3.Error, DatabaseError) as e:
+        conn.rollback()
+        if is_database_locked(e):
+            raise
+        log_message(f"Error in take_tmdb_rate_token: {e}", level="ERROR")
+        return None
+
+@retry_on_db_lock
+@with_connection(tmdb_cache_pool)
+def get_negative_cache_expiry(conn, key):
+    """Return the expiry time of a cached TMDB miss, or None if the key is not cached."""
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT expires_at FROM tmdb_negative_cache WHERE key = ?", (key,))
+        row = cursor.fetchone()
+        return row[0] if row else None
+    except (sqlite3.Error, DatabaseError) as e:
+        log_message(f"Error in get_negative_cache_expiry: {e}", level="ERROR")
+        conn.rollback()
+        return None
+
+@retry_on_db_lock
+@with_connection(tmdb_cache_pool)
+def save_negative_cache_entry(conn, key, expires_at):
+    """Record a TMDB search variant that returned no usable result."""
+    try:
+        conn.execute("""
+            INSERT INTO tmdb_negative_cache (key, expires_at) VALUES (?, ?)
+            ON CONFLICT(key) DO UPDATE SET expires_at = excluded.expires_at
+        """, (key, expires_at))
+        conn.commit()
+    except (sqlite3.Error, DatabaseError) as e:
+        log_message(f"Error in save_negative_cache_entry: {e}", level="ERROR")
+        conn.rollback()
+
 initialize_db()
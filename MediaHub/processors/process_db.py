@@ -31,29 +31,69 @@ def initialize_file_database():
                 path TEXT PRIMARY KEY,
                 is_symlink BOOLEAN,
                 target_path TEXT,
-                last_modified TIMESTAMP
+                last_modified TIMESTAMP,
+                target_dir TEXT
             )
         ''')
+
+        cursor.execute("PRAGMA table_info(file_index)")
+        columns = [column[1] for column in cursor.fetchall()]
+
+        # Parent directory of the target so "everything under X" is an index range scan
+        if "target_dir" not in columns:
+            cursor.execute("ALTER TABLE file_index ADD COLUMN target_dir TEXT")
+            cursor.execute("SELECT rowid, target_path FROM file_index WHERE target_path IS NOT NULL")
+            cursor.executemany("UPDATE file_index SET target_dir = ? WHERE rowid = ?",
+                               [(os.path.dirname(target_path), rowid) for rowid, target_path in cursor.fetchall()])
+            log_message("Added target_dir column to file_index table.", level="INFO")
+
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_file_index_target_path ON file_index(target_path)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_file_index_target_dir ON file_index(target_dir)")
         conn.commit()
 
-def update_file_index(dest_dir):
-    with sqlite3.connect(PROCESS_DB) as conn:
-        cursor = conn.cursor()
-        cursor.execute('DELETE FROM file_index')
+def update_file_index(dest_dir, batch_size=1000):
+    """
+    Reconcile file_index with a walk of dest_dir. The walk runs outside any transaction;
+    rows are upserted in short batches and entries the walk did not see are removed only
+    once they are confirmed gone, so the table is never emptied and concurrent writers
+    wait for at most one batch.
+    """
+    seen = set()
+    batch = []
 
-        for root, _, files in os.walk(dest_dir):
-            for file in files:
-                full_path = os.path.join(root, file)
+    def flush():
+        with sqlite3.connect(PROCESS_DB) as conn:
+            conn.executemany('''
+                INSERT OR REPLACE INTO file_index (path, is_symlink, target_path, last_modified, target_dir)
+                VALUES (?, ?, ?, ?, ?)
+            ''', batch)
+            conn.commit()
+        batch.clear()
+
+    for root, _, files in os.walk(dest_dir):
+        for file in files:
+            full_path = os.path.join(root, file)
+            try:
                 is_symlink = os.path.islink(full_path)
                 target_path = os.readlink(full_path) if is_symlink else None
-                last_modified = os.path.getmtime(full_path)
-
-                cursor.execute('''
-                    INSERT INTO file_index (path, is_symlink, target_path, last_modified)
-                    VALUES (?, ?, ?, ?)
-                ''', (full_path, is_symlink, target_path, last_modified))
+                last_modified = os.lstat(full_path).st_mtime
+            except OSError:
+                # Removed while the walk was running
+                continue
+            target_dir = os.path.dirname(target_path) if target_path else None
+            seen.add(full_path)
+            batch.append((full_path, is_symlink, target_path, last_modified, target_dir))
+            if len(batch) >= batch_size:
+                flush()
+    if batch:
+        flush()
 
-        conn.commit()
+    with sqlite3.connect(PROCESS_DB) as conn:
+        unseen = [path for (path,) in conn.execute('SELECT path FROM file_index') if path not in seen]
+    # Entries written by other threads after the walk passed their directory still exist
+    stale = [path for path in unseen if not os.path.lexists(path)]
+    for start in range(0, len(stale), batch_size):
+        remove_file_index_entries(stale[start:start + batch_size])
 
 def get_dest_index_from_db():
     with sqlite3.connect(PROCESS_DB) as conn:
@@ -61,13 +101,59 @@ def get_dest_index_from_db():
         cursor.execute('SELECT path FROM file_index')
         return [row[0] for row in cursor.fetchall()]
 
+def get_symlink_target_index_from_db():
+    """Build a target -> symlink reverse index from the file_index table."""
+    with sqlite3.connect(PROCESS_DB) as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT target_path, path FROM file_index WHERE is_symlink = 1 AND target_path IS NOT NULL')
+        return dict(cursor.fetchall())
+
+def select_symlinks_under(cursor, directory):
+    """
+    Return (path, target_path) rows whose target is the directory itself or anywhere below it.
+    Served by index lookups on target_path and range scans on target_dir.
+    """
+    directory = os.path.normpath(directory)
+    prefix = directory.rstrip(os.sep) + os.sep
+    upper = prefix[:-1] + chr(ord(os.sep) + 1)
+    cursor.execute('''
+        SELECT path, target_path FROM file_index WHERE target_path = ?
+        UNION ALL
+        SELECT path, target_path FROM file_index WHERE target_dir = ?
+        UNION ALL
+        SELECT path, target_path FROM file_index WHERE target_dir >= ? AND target_dir < ?
+    ''', (directory, directory, prefix, upper))
+    return cursor.fetchall()
+
+def get_symlink_targets_by_dir():
+    """
+    Group every indexed symlink by the directory of its target.
+    Returns {target_dir: [(symlink_path, target_path), ...]} with absolute target paths.
+    """
+    targets_by_dir = {}
+    with sqlite3.connect(PROCESS_DB) as conn:
+        cursor = conn.cursor()
+        cursor.execute('SELECT path, target_path FROM file_index WHERE is_symlink = 1 AND target_path IS NOT NULL')
+        for symlink_path, target_path in cursor:
+            if not os.path.isabs(target_path):
+                target_path = os.path.normpath(os.path.join(os.path.dirname(symlink_path), target_path))
+            targets_by_dir.setdefault(os.path.dirname(target_path), []).append((symlink_path, target_path))
+    return targets_by_dir
+
+def remove_file_index_entries(paths):
+    """Delete a batch of file_index entries in a single transaction."""
+    with sqlite3.connect(PROCESS_DB) as conn:
+        conn.executemany('DELETE FROM file_index WHERE path = ?', [(path,) for path in paths])
+        conn.commit()
+
 def update_single_file_index(dest_file, is_symlink, target_path):
     """Update a single file entry in the database."""
     with sqlite3.connect(PROCESS_DB) as conn:
         cursor = conn.cursor()
         last_modified = os.path.getmtime(dest_file)
+        target_dir = os.path.dirname(target_path) if target_path else None
         cursor.execute('''
-            INSERT OR REPLACE INTO file_index (path, is_symlink, target_path, last_modified)
-            VALUES (?, ?, ?, ?)
-        ''', (dest_file, is_symlink, target_path, last_modified))
+            INSERT OR REPLACE INTO file_index (path, is_symlink, target_path, last_modified, target_dir)
+            VALUES (?, ?, ?, ?, ?)
+        ''', (dest_file, is_symlink, target_path, last_modified, target_dir))
         conn.commit()
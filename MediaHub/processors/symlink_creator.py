@@ -7,13 +7,16 @@ import sqlite3
 from threading import Thread
 from queue import Queue, Empty
 from threading import Thread, Event
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 from multiprocessing import cpu_count
 from threading import Event
 from MediaHub.processors.movie_processor import process_movie
 from MediaHub.processors.show_processor import process_show
 from MediaHub.utils.logging_utils import log_message
-from MediaHub.utils.file_utils import build_dest_index, get_anime_patterns, is_junk_file
+from MediaHub.utils.file_utils import build_dest_index, build_symlink_target_index, get_anime_patterns, is_junk_file
+from MediaHub.utils.scan_utils import SourceScanner
+from MediaHub.api.tmdb_client import get_tmdb_client
+from MediaHub.api.rate_limiter import get_rate_limiter, set_request_priority, PRIORITY_INTERACTIVE, PRIORITY_MONITOR, PRIORITY_BACKFILL
 from MediaHub.monitor.symlink_cleanup import run_symlink_cleanup
 from MediaHub.config.config import *
 from MediaHub.processors.db_utils import *
@@ -25,7 +28,7 @@ error_event = Event()
 log_imported_db = False
 db_initialized = False
 
-def process_file(args, processed_files_log, force=False):
+def process_file(args, processed_files_log, force, symlink_index, file_records=None, entry=None):
     src_file, root, file, dest_dir, actual_dir, tmdb_folder_id_enabled, rename_enabled, auto_select, dest_index, tmdb_id, imdb_id, tvdb_id, force_show, force_movie, season_number, episode_number, force_extra, skip = args
 
     if error_event.is_set():
@@ -35,8 +38,9 @@ def process_file(args, processed_files_log, force=False):
     src_file = os.path.normpath(src_file)
 
     # Check for unsupported file type or skip flag
-    if not get_known_types(file) or skip:
-        reason = "Unsupported file type" if not get_known_types(file) else "Skipped by user"
+    is_known_type = get_known_types(file)
+    if not is_known_type or skip:
+        reason = "Unsupported file type" if not is_known_type else "Skipped by user"
         log_message(f"Skipping file: {file} ({reason})", level="INFO")
         save_processed_file(src_file, None, tmdb_id, season_number, reason)
         return
@@ -51,6 +55,7 @@ def process_file(args, processed_files_log, force=False):
             parent_dir = os.path.dirname(existing_symlink_path)
             parent_parent_dir = os.path.dirname(parent_dir)
             os.remove(existing_symlink_path)
+            symlink_index.pop(src_file, None)
             log_message(f"Force mode: Initiating reprocessing of {file}", level="INFO")
 
             # Delete if parent directory is empty
@@ -65,7 +70,12 @@ def process_file(args, processed_files_log, force=False):
             except OSError as e:
                 log_message(f"Error deleting directory: {e}", level="WARNING")
 
-    existing_dest_path = get_destination_path(src_file)
+    # Resolve destination and skip reason with a single lookup
+    if file_records is not None:
+        file_record = file_records.get(src_file)
+    else:
+        file_record = get_file_record(src_file)
+    existing_dest_path = file_record[0] if file_record else None
     if existing_dest_path and not force:
         return
         if not os.path.exists(existing_dest_path):
@@ -85,13 +95,12 @@ def process_file(args, processed_files_log, force=False):
 
     else:
         if not force:
-            skip_reason = get_skip_reason(src_file)
+            skip_reason = file_record[3] if file_record else None
             if skip_reason:
                 return
 
-    # Check if a symlink already exists
-    existing_symlink = next((full_dest_file for full_dest_file in dest_index
-                             if os.path.islink(full_dest_file) and os.readlink(full_dest_file) == src_file), None)
+    # Check if a symlink already exists using the target -> symlink reverse index
+    existing_symlink = symlink_index.get(src_file)
 
     if existing_symlink and not force:
         log_message(f"Symlink already exists for {os.path.basename(file)}", level="INFO")
@@ -139,7 +148,7 @@ def process_file(args, processed_files_log, force=False):
             log_message(f"Processing as show based on anime pattern: {src_file}", level="DEBUG")
 
     # Check if the file should be considered an junk based on size
-    if is_junk_file(file, src_file):
+    if is_junk_file(file, src_file, entry):
         log_message(f"Skipping Junk files: {file} based on size", level="DEBUG")
         reason = "File size below minimum threshold"
         save_processed_file(src_file, None, tmdb_id, season_number, reason)
@@ -187,6 +196,7 @@ def process_file(args, processed_files_log, force=False):
         else:
             log_message(f"Updating existing symlink: {dest_file} -> {src_file} (was: {existing_src})", level="INFO")
             os.remove(dest_file)
+            symlink_index.pop(existing_src, None)
 
     if os.path.exists(dest_file) and not os.path.islink(dest_file):
         log_message(f"File already exists at destination: {os.path.basename(dest_file)}", level="INFO")
@@ -195,6 +205,7 @@ def process_file(args, processed_files_log, force=False):
     # Create symlink
     try:
         os.symlink(src_file, dest_file)
+        symlink_index[src_file] = dest_file
         log_message(f"Created symlink: {dest_file} -> {src_file}", level="INFO")
         log_message(f"Processed file: {src_file} to {dest_file}", level="INFO")
         save_processed_file(src_file, dest_file, tmdb_id, season_number)
@@ -223,8 +234,8 @@ def create_symlinks(src_dirs, dest_dir, auto_select=False, single_path=None, for
     skip_extras_folder = is_skip_extras_folder_enabled()
     imdb_structure_id_enabled = is_imdb_folder_id_enabled()
 
-    # Initialize database if in monitor mode
-    if mode == 'monitor' and not os.path.exists(PROCESS_DB):
+    # Every mode keeps file_index current, since symlink cleanup is driven from it
+    if not os.path.exists(PROCESS_DB):
         initialize_file_database()
 
     # Use single_path if provided
@@ -234,10 +245,32 @@ def create_symlinks(src_dirs, dest_dir, auto_select=False, single_path=None, for
     # Load the record of processed files
     processed_files_log = load_processed_files()
 
+    # Build the destination indexes once per scan based on mode
+    if mode == 'monitor':
+        dest_index = get_dest_index_from_db()
+        symlink_index = get_symlink_target_index_from_db()
+    else:
+        dest_index = build_dest_index(dest_dir)
+        symlink_index = build_symlink_target_index(dest_dir)
+
+    # Full library scans only descend into directories whose fingerprint changed
+    scanner = SourceScanner(incremental=mode == 'create' and not force and not single_path and is_incremental_scan_enabled())
+
+    def handle_result(result):
+        if result and isinstance(result, tuple) and len(result) == 3:
+            dest_file, is_symlink, target_path = result
+            update_single_file_index(dest_file, is_symlink, target_path)
+
+    # Full library scans yield TMDB capacity to interactive and monitor lookups
+    priority = PRIORITY_BACKFILL if mode == 'create' and not single_path else PRIORITY_INTERACTIVE
+
     if auto_select:
         # Use thread pool for parallel processing when auto-select is enabled
-        tasks = []
-        with ThreadPoolExecutor(max_workers=cpu_count()) as executor:
+        # Only a bounded number of tasks is kept in flight so memory does not grow with library size
+        max_workers = cpu_count()
+        max_in_flight = max_workers * 4
+        tasks = set()
+        with ThreadPoolExecutor(max_workers=max_workers, initializer=set_request_priority, initargs=(priority,)) as executor:
             for src_dir in src_dirs:
                 if os.path.isfile(src_dir):
                     src_file = src_dir
@@ -245,54 +278,58 @@ def create_symlinks(src_dirs, dest_dir, auto_select=False, single_path=None, for
                     file = os.path.basename(src_file)
                     actual_dir = os.path.basename(root)
 
-                    # Get appropriate destination index based on mode
-                    dest_index = (get_dest_index_from_db() if mode == 'monitor'
-                                else build_dest_index(dest_dir))
-
                     args = (src_file, root, file, dest_dir, actual_dir, tmdb_folder_id_enabled, rename_enabled, auto_select, dest_index, tmdb_id, imdb_id, tvdb_id, force_show, force_movie, season_number, episode_number, force_extra, skip)
-                    tasks.append(executor.submit(process_file, args, processed_files_log, force))
+                    tasks.add(executor.submit(process_file, args, processed_files_log, force, symlink_index))
                 else:
                     # Handle directory
                     actual_dir = os.path.basename(os.path.normpath(src_dir))
                     log_message(f"Scanning source directory: {src_dir} (actual: {actual_dir})", level="INFO")
 
-                    # Get appropriate destination index based on mode
-                    dest_index = (get_dest_index_from_db() if mode == 'monitor'
-                                else build_dest_index(dest_dir))
+                    for root, entries in scanner.walk(src_dir):
+                        # Resolve existing records for the whole directory in one query
+                        file_records = get_file_records([entry.path for entry in entries])
 
-                    for root, _, files in os.walk(src_dir):
-                        for file in files:
+                        for entry in entries:
                             if error_event.is_set():
                                 log_message("Stopping further processing due to an earlier error.", level="WARNING")
+                                flush_pending_writes()
                                 return
 
-                            src_file = os.path.join(root, file)
+                            src_file = entry.path
+                            file = entry.name
 
                             if mode == 'create' and src_file in processed_files_log and not force:
                                 continue
 
                             args = (src_file, root, file, dest_dir, actual_dir, tmdb_folder_id_enabled, rename_enabled, auto_select, dest_index, tmdb_id, imdb_id, tvdb_id, force_show, force_movie, season_number, episode_number, force_extra, skip)
-                            tasks.append(executor.submit(process_file, args, processed_files_log, force))
+                            tasks.add(executor.submit(process_file, args, processed_files_log, force, symlink_index, file_records, entry))
+
+                            if len(tasks) >= max_in_flight:
+                                done, tasks = wait(tasks, return_when=FIRST_COMPLETED)
+                                for task in done:
+                                    try:
+                                        handle_result(task.result())
+                                    except Exception as e:
+                                        log_message(f"Error processing task: {str(e)}", level="ERROR")
 
             # Process completed tasks
             for task in as_completed(tasks):
                 if error_event.is_set():
                     log_message("Error detected during task execution. Stopping all tasks.", level="WARNING")
+                    flush_pending_writes()
                     return
 
                 try:
-                    result = task.result()
-                    if result and isinstance(result, tuple) and len(result) == 3:
-                        dest_file, is_symlink, target_path = result
-                        if mode == 'monitor':
-                            update_single_file_index(dest_file, is_symlink, target_path)
+                    handle_result(task.result())
                 except Exception as e:
                     log_message(f"Error processing task: {str(e)}", level="ERROR")
     else:
         # Process sequentially when auto-select is disabled
+        set_request_priority(priority)
         for src_dir in src_dirs:
             if error_event.is_set():
                 log_message("Stopping further processing due to an earlier error.", level="WARNING")
+                flush_pending_writes()
                 return
 
             try:
@@ -302,43 +339,133 @@ def create_symlinks(src_dirs, dest_dir, auto_select=False, single_path=None, for
                     file = os.path.basename(src_file)
                     actual_dir = os.path.basename(root)
 
-                    # Get appropriate destination index based on mode
-                    dest_index = (get_dest_index_from_db() if mode == 'monitor'
-                                else build_dest_index(dest_dir))
-
                     args = (src_file, root, file, dest_dir, actual_dir, tmdb_folder_id_enabled, rename_enabled, auto_select, dest_index, tmdb_id, imdb_id, tvdb_id, force_show, force_movie, season_number, episode_number, force_extra, skip)
-                    result = process_file(args, processed_files_log, force)
-
-                    if result and isinstance(result, tuple) and len(result) == 3:
-                        dest_file, is_symlink, target_path = result
-                        if mode == 'monitor':
-                            update_single_file_index(dest_file, is_symlink, target_path)
+                    handle_result(process_file(args, processed_files_log, force, symlink_index))
                 else:
                     # Handle directory
                     actual_dir = os.path.basename(os.path.normpath(src_dir))
                     log_message(f"Scanning source directory: {src_dir} (actual: {actual_dir})", level="INFO")
 
-                    # Get appropriate destination index based on mode
-                    dest_index = (get_dest_index_from_db() if mode == 'monitor'
-                                else build_dest_index(dest_dir))
+                    for root, entries in scanner.walk(src_dir):
+                        # Resolve existing records for the whole directory in one query
+                        file_records = get_file_records([entry.path for entry in entries])
 
-                    for root, _, files in os.walk(src_dir):
-                        for file in files:
+                        for entry in entries:
                             if error_event.is_set():
                                 log_message("Stopping further processing due to an earlier error.", level="WARNING")
+                                flush_pending_writes()
                                 return
 
-                            src_file = os.path.join(root, file)
+                            src_file = entry.path
+                            file = entry.name
 
                             if mode == 'create' and src_file in processed_files_log and not force:
                                 continue
 
                             args = (src_file, root, file, dest_dir, actual_dir, tmdb_folder_id_enabled, rename_enabled, auto_select, dest_index, tmdb_id, imdb_id, tvdb_id, force_show, force_movie, season_number, episode_number, force_extra, skip)
-                            result = process_file(args, processed_files_log, force)
-
-                            if result and isinstance(result, tuple) and len(result) == 3:
-                                dest_file, is_symlink, target_path = result
-                                if mode == 'monitor':
-                                    update_single_file_index(dest_file, is_symlink, target_path)
+                            handle_result(process_file(args, processed_files_log, force, symlink_index, file_records, entry))
             except Exception as e:
                 log_message(f"Error processing directory {src_dir}: {str(e)}", level="ERROR")
+
+    # Commit any queued database writes before returning to the caller
+    flush_pending_writes()
+    scanner.commit()
+
+    for name, stats in get_rate_limiter().get_stats().items():
+        if stats['queued']:
+            log_message(f"TMDB rate limiter ({name}): {stats['queued']}/{stats['requests']} requests queued, {stats['wait_seconds']:.1f}s total, {stats['max_wait_seconds']:.2f}s max", level="INFO")
+    cache_stats = get_tmdb_client().cache.get_stats()
+    if any(cache_stats.values()):
+        log_message(f"TMDB response cache: {cache_stats['hits']} hits, {cache_stats['revalidated']} revalidated, {cache_stats['misses']} fetched", level="INFO")
+    coalesced = get_tmdb_client().flights.coalesced
+    if coalesced:
+        log_message(f"TMDB requests coalesced with identical in-flight requests: {coalesced}", level="INFO")
+    negative_stats = get_tmdb_client().negative_cache.get_stats()
+    if negative_stats['hits']:
+        log_message(f"TMDB negative cache: {negative_stats['hits']} searches skipped for known unresolvable queries", level="INFO")
+
+class SymlinkEngine:
+    """
+    Long-lived symlink processor for the monitor. The processed set, destination and
+    target indexes, configuration snapshot and worker pool are loaded once and kept up to
+    date as files are processed, so each new file costs a single batched record lookup
+    instead of a full create_symlinks setup.
+    """
+
+    def __init__(self, dest_dir, auto_select=True, max_workers=None):
+        self.dest_dir = dest_dir
+        self.auto_select = auto_select
+        os.makedirs(dest_dir, exist_ok=True)
+        initialize_file_database()
+
+        self.tmdb_folder_id_enabled = is_tmdb_folder_id_enabled()
+        self.rename_enabled = is_rename_enabled()
+
+        self.processed_files_log = load_processed_files()
+        self.dest_index = set(get_dest_index_from_db())
+        self.symlink_index = get_symlink_target_index_from_db()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers or cpu_count(), initializer=set_request_priority, initargs=(PRIORITY_MONITOR,))
+        self.stats = {'submitted': 0, 'completed': 0, 'symlinks_created': 0, 'errors': 0}
+
+    def submit(self, paths):
+        """
+        Queue files or directories for processing and return the futures.
+        Directories are walked with the concurrent source scanner.
+        """
+        futures = []
+        files = []
+        for path in paths:
+            path = os.path.normpath(path)
+            if os.path.isdir(path):
+                actual_dir = os.path.basename(path)
+                for root, entries in SourceScanner(incremental=False).walk(path):
+                    futures.extend(self._submit_files([(entry.path, entry) for entry in entries], actual_dir))
+            else:
+                files.append((path, None))
+
+        # Loose files are grouped by directory so each group resolves its records in one query
+        by_dir = {}
+        for path, entry in files:
+            by_dir.setdefault(os.path.dirname(path), []).append((path, entry))
+        for root, group in by_dir.items():
+            futures.extend(self._submit_files(group, os.path.basename(root)))
+        return futures
+
+    def _submit_files(self, files, actual_dir):
+        file_records = get_file_records([path for path, _ in files])
+        futures = []
+        for src_file, entry in files:
+            root = os.path.dirname(src_file)
+            file = os.path.basename(src_file)
+            args = (src_file, root, file, self.dest_dir, actual_dir, self.tmdb_folder_id_enabled, self.rename_enabled, self.auto_select, self.dest_index, None, None, None, False, False, None, None, False, False)
+            future = self.executor.submit(process_file, args, self.processed_files_log, False, self.symlink_index, file_records, entry)
+            self.stats['submitted'] += 1
+            future.add_done_callback(self._task_done)
+            futures.append(future)
+        return futures
+
+    def _task_done(self, future):
+        self.stats['completed'] += 1
+        try:
+            result = future.result()
+        except Exception as e:
+            self.stats['errors'] += 1
+            log_message(f"Error processing task: {str(e)}", level="ERROR")
+            return
+
+        if result and isinstance(result, tuple) and len(result) == 3:
+            self.stats['symlinks_created'] += 1
+            dest_file, is_symlink, target_path = result
+            update_single_file_index(dest_file, is_symlink, target_path)
+            self.dest_index.add(dest_file)
+            self.processed_files_log.add(target_path)
+
+    def wait(self, futures):
+        """Block until the given futures finish and their database writes are committed."""
+        if futures:
+            wait(futures)
+        flush_pending_writes()
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+        flush_pending_writes()
@@ -15,20 +15,9 @@ def delete_broken_symlinks(dest_dir, removed_path=None):
         dest_dir: The destination directory containing symlinks
         removed_path: Optional path of the removed file/folder to check
     """
-    # Ensure database tables exist
+    # Ensure database tables and indexes exist
     try:
-        with sqlite3.connect(PROCESS_DB) as conn:
-            cursor = conn.cursor()
-            # Create file_index table if it doesn't exist
-            cursor.execute('''
-                CREATE TABLE IF NOT EXISTS file_index (
-                    path TEXT PRIMARY KEY,
-                    is_symlink BOOLEAN,
-                    target_path TEXT,
-                    last_modified TIMESTAMP
-                )
-            ''')
-            conn.commit()
+        initialize_file_database()
     except sqlite3.Error as e:
         return False
 
@@ -51,21 +40,9 @@ def delete_broken_symlinks(dest_dir, removed_path=None):
                 if is_directory:
                     log_message(f"Processing directory removal: {removed_path}", level="INFO")
 
-                    # Find the exact path to search for
-                    exact_path = removed_path
-                    # Also search for paths that might be inside this directory
-                    directory_path = f"{removed_path}/%"
-
-                    log_message(f"Using search patterns: exact={exact_path}, directory={directory_path}", level="DEBUG")
-
-                    # Query file_index table ONLY
+                    # Query file_index for the directory and everything below it
                     log_message("Querying file_index table for matching paths", level="DEBUG")
-                    cursor2.execute("""
-                        SELECT path, target_path
-                        FROM file_index
-                        WHERE target_path = ? OR target_path LIKE ?
-                    """, (exact_path, directory_path))
-                    file_index_results = cursor2.fetchall()
+                    file_index_results = select_symlinks_under(cursor2, removed_path)
                     log_message(f"Found {len(file_index_results)} matching entries in file_index", level="DEBUG")
 
                     # Process only file_index results
@@ -225,10 +202,8 @@ def delete_broken_symlinks(dest_dir, removed_path=None):
                     file_index_results = cursor2.fetchall()
 
                     if not file_index_results:
-                        pattern = f"{removed_path}%"
-                        cursor2.execute("SELECT path, target_path FROM file_index WHERE target_path LIKE ?", (pattern,))
-                        file_index_pattern_results = cursor2.fetchall()
-                        file_index_results = file_index_pattern_results
+                        # The path may have been a directory that no longer exists
+                        file_index_results = select_symlinks_under(cursor2, removed_path)
 
                     # Process database-tracked symlinks
                     all_paths = set()
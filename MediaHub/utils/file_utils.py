@@ -212,6 +212,29 @@ def build_dest_index(dest_dir):
             dest_index.add(os.path.join(root, name))
     return dest_index
 
+def build_symlink_target_index(dest_dir):
+    """
+    Build a reverse index mapping each symlink target to the symlink that points at it.
+    Every symlink is read once per scan so lookups by source path need no filesystem calls.
+    """
+    symlink_index = {}
+    pending_dirs = [dest_dir]
+    while pending_dirs:
+        directory = pending_dirs.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_symlink():
+                        try:
+                            symlink_index[os.readlink(entry.path)] = entry.path
+                        except OSError as e:
+                            log_message(f"Error reading symlink {entry.path}: {e}", level="WARNING")
+                    elif entry.is_dir():
+                        pending_dirs.append(entry.path)
+        except OSError as e:
+            log_message(f"Error scanning destination directory {directory}: {e}", level="WARNING")
+    return symlink_index
+
 def standardize_title(title, check_word_count=True):
     replacements = {
         '0': 'o', '1': 'i', '4': 'a', '5': 's', '7': 't', '9': 'g',
@@ -289,19 +312,21 @@ def get_anime_patterns(keywords_file='keywords.json'):
     combined_pattern = '|'.join(f'(?:{pattern})' for pattern in anime_patterns)
     return re.compile(combined_pattern, re.IGNORECASE)
 
-def is_junk_file(file, file_path):
+def is_junk_file(file, file_path, entry=None):
      """
      Determine if the file is an junk based on size.
      Skip .srt & .strm files regardless of size.
+     An os.DirEntry from the directory scan can be passed to reuse its cached type and stat data.
      """
-     if os.path.islink(file_path):
+     if entry.is_symlink() if entry is not None else os.path.islink(file_path):
          return False
 
      # Ignore .srt and .strm files completely
      if file.lower().endswith(('.srt', '.strm')):
          return False
 
-     file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
+     file_size = entry.stat().st_size if entry is not None else os.path.getsize(file_path)
+     file_size_mb = file_size / (1024 * 1024)
 
      junk_max_size_mb = get_junk_max_size_mb()
 
@@ -0,0 +1,207 @@
+import os
+import queue
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from MediaHub.utils.logging_utils import log_message
+from MediaHub.config.config import get_source_scan_workers
+from MediaHub.processors.db_utils import load_directory_fingerprints, save_directory_fingerprints, get_files_in_directory
+
+_WALK_DONE = object()
+
+class SourceScanner:
+    """
+    Walks source directories like os.walk, but skips listing directories whose stored mtime
+    is unchanged and whose files are all processed. Unchanged directories are only stat'ed
+    so changes deeper in the tree are still found. A directory whose mtime moved but whose
+    entry count and name hash still match is listed without its files being handed over.
+    Fingerprints are saved in batches while the walk runs, once the files of a directory
+    have had time to be processed, so memory stays bounded and a crash keeps earlier work.
+    """
+
+    # Directories whose fingerprints are saved together
+    FLUSH_BATCH = 256
+
+    def __init__(self, incremental=True, workers=None, queue_size=64):
+        self.incremental = incremental
+        self.workers = workers or get_source_scan_workers()
+        self.queue_size = queue_size
+        # Recently listed directories are held back while their files are still being processed
+        self.flush_lag = queue_size * 4
+        self._listed = {}
+        self._incomplete = {}
+        self._removed = []
+        self.listed_dirs = 0
+        self.skipped_dirs = 0
+
+    @staticmethod
+    def _name_hash(names):
+        digest = hashlib.sha1()
+        for name in sorted(names):
+            digest.update(name.encode('utf-8', 'surrogateescape'))
+            digest.update(b'\0')
+        return digest.hexdigest()
+
+    def _visit(self, directory, fingerprint):
+        """Stat a directory and list it unless its fingerprint says nothing changed. Runs on a lister thread."""
+        try:
+            mtime = os.stat(directory).st_mtime
+        except OSError as e:
+            log_message(f"Error reading directory {directory}: {e}", level="WARNING")
+            return None
+
+        if fingerprint and fingerprint[1] == mtime and fingerprint[4]:
+            return mtime, None, None
+
+        files = []
+        subdirs = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        # Match os.walk: symlinked directories are not descended into
+                        if not entry.is_symlink():
+                            subdirs.append(entry.path)
+                    else:
+                        files.append(entry)
+        except OSError as e:
+            log_message(f"Error scanning source directory {directory}: {e}", level="WARNING")
+            return None
+        return mtime, files, subdirs
+
+    def _produce(self, src_dir, results, stop):
+        """Walk src_dir with concurrent listings, feeding (root, entries) into the bounded results queue."""
+        try:
+            known = load_directory_fingerprints(src_dir) if self.incremental else {}
+            children = {}
+            for path, fingerprint in known.items():
+                children.setdefault(fingerprint[0], []).append(path)
+
+            pending_dirs = [src_dir]
+            in_flight = {}
+            with ThreadPoolExecutor(max_workers=self.workers) as listers:
+                while (pending_dirs or in_flight) and not stop.is_set():
+                    while pending_dirs and len(in_flight) < self.workers:
+                        directory = pending_dirs.pop()
+                        in_flight[listers.submit(self._visit, directory, known.get(directory))] = directory
+
+                    done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        directory = in_flight.pop(future)
+                        visit = future.result()
+                        if visit is None:
+                            if directory in known:
+                                self._removed.append(directory)
+                            continue
+
+                        mtime, files, subdirs = visit
+                        if files is None:
+                            # Nothing was added, removed or renamed here since the last complete scan
+                            self.skipped_dirs += 1
+                            pending_dirs.extend(children.get(directory, ()))
+                            continue
+
+                        self.listed_dirs += 1
+                        current_subdirs = set(subdirs)
+                        for child in children.get(directory, ()):
+                            if child not in current_subdirs:
+                                self._removed.append(child)
+
+                        unchanged = False
+                        if self.incremental:
+                            parent_path = os.path.dirname(directory) if directory != src_dir else None
+                            file_names = [entry.name for entry in files]
+                            names = file_names + [os.path.basename(path) for path in subdirs]
+                            name_hash = self._name_hash(names)
+                            fingerprint = known.get(directory)
+                            # Only the mtime moved (e.g. a metadata touch); the same fully processed entries are still there
+                            unchanged = bool(fingerprint and fingerprint[4] and fingerprint[2] == len(names) and fingerprint[3] == name_hash)
+                            self._listed[directory] = (parent_path, mtime, len(names), name_hash, [] if unchanged else file_names)
+                            if len(self._listed) >= self.flush_lag + self.FLUSH_BATCH:
+                                self._flush(self.FLUSH_BATCH)
+                        pending_dirs.extend(subdirs)
+
+                        if unchanged:
+                            self.skipped_dirs += 1
+                        elif files:
+                            self._put(results, (directory, files), stop)
+        except Exception as e:
+            log_message(f"Error walking source directory {src_dir}: {e}", level="ERROR")
+        finally:
+            self._put(results, _WALK_DONE, stop)
+
+    @staticmethod
+    def _put(results, item, stop):
+        while not stop.is_set():
+            try:
+                results.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def walk(self, src_dir):
+        """
+        Yield (root, file_entries) for every directory that needs its files looked at.
+        file_entries are os.DirEntry objects so callers can reuse the cached type and stat data.
+        Directories are listed concurrently and handed over through a bounded queue, so
+        processing starts with the first listing and memory does not grow with library size.
+        """
+        src_dir = os.path.normpath(src_dir)
+        results = queue.Queue(maxsize=self.queue_size)
+        stop = threading.Event()
+        producer = threading.Thread(target=self._produce, args=(src_dir, results, stop), daemon=True)
+        producer.start()
+        try:
+            while True:
+                item = results.get()
+                if item is _WALK_DONE:
+                    break
+                yield item
+        finally:
+            stop.set()
+            producer.join()
+
+    def _fingerprint_rows(self, listed):
+        """
+        Build fingerprint rows for listed directories. A directory is only marked complete
+        when every file in it has a processed_files record; incomplete ones are returned
+        separately so they can be checked again at commit.
+        """
+        rows = []
+        incomplete = {}
+        for directory, (parent_path, mtime, entry_count, name_hash, files) in listed:
+            complete = True
+            if files:
+                recorded = set(get_files_in_directory(directory))
+                complete = all(os.path.join(directory, name) in recorded for name in files)
+            rows.append((directory, parent_path, mtime, entry_count, name_hash, int(complete)))
+            if not complete:
+                incomplete[directory] = (parent_path, mtime, entry_count, name_hash, files)
+        return rows, incomplete
+
+    def _flush(self, count):
+        """Save the fingerprints of the count oldest listed directories and drop their file names."""
+        oldest = [(directory, self._listed.pop(directory)) for directory in list(self._listed)[:count]]
+        rows, incomplete = self._fingerprint_rows(oldest)
+        self._incomplete.update(incomplete)
+        removed, self._removed = self._removed, []
+        save_directory_fingerprints(rows, removed)
+
+    def commit(self):
+        """
+        Persist fingerprints for the directories still held from this scan, and mark those
+        that were incomplete at their first save complete if their files have since been
+        recorded. Directories holding failed or unfinished files are listed again next time.
+        """
+        if not self.incremental or (not self._listed and not self._incomplete and not self._removed):
+            return
+
+        self._flush(len(self._listed))
+        retried, self._incomplete = self._incomplete, {}
+        rows, still_incomplete = self._fingerprint_rows(retried.items())
+        save_directory_fingerprints([row for row in rows if row[0] not in still_incomplete])
+        log_message(f"Incremental scan listed {self.listed_dirs} directories and skipped {self.skipped_dirs} unchanged directories.", level="INFO")